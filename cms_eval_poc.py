@@ -3,13 +3,46 @@ Home Warranty CMS Evaluation Framework – Streamlit PoC
 Interactive tool to evaluate and score CMS platforms for Home Warranty company requirements
 """
 
+import io
 import json
+import importlib.util
+import atexit
+import string
+import hashlib
 import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
+import numpy as np
 from datetime import datetime
-from typing import Dict, List, Any
-from llm_providers import get_provider, get_available_providers, OllamaProvider, AnthropicProvider
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional
+from llm_providers import get_provider
+from scoring import score_platforms
+from data_agents import (
+    CMSDataAgent, VendorData, RAW_PREVIEW_CHARS,
+    save_raw_content, save_vendor_data, load_cached_vendor_data, background_loop
+)
+
+# Report export backends are optional; Tab 5 disables a format when its library is missing.
+# Availability is checked without importing them: the imports (lxml, PIL, fonts) are slow
+# and happen in the background, see _warm_report_imports().
+DOCX_AVAILABLE = importlib.util.find_spec("docx") is not None
+PPTX_AVAILABLE = importlib.util.find_spec("pptx") is not None
+PDF_AVAILABLE = importlib.util.find_spec("reportlab") is not None
+
+# Cache keys hash multi-KB prompts on every rerun; blake3 is much faster than sha256 when installed
+try:
+    from blake3 import blake3 as _hasher
+except ImportError:
+    _hasher = hashlib.sha256
+
+
+def _digest(data: bytes) -> str:
+    """Hex digest used for cache keys (blake3 when available, else sha256)."""
+    return _hasher(data).hexdigest()
 
 # ============================================================================
 # ONTOLOGY & DATA
@@ -258,11 +291,618 @@ PLATFORMS_DATA = {
     }
 }
 
+
+def _freeze(value):
+    """Recursively wrap dicts in read-only MappingProxyType views."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+# Both are read-only config; live data goes through capability_overrides instead
+CMS_ONTOLOGY = _freeze(CMS_ONTOLOGY)
+PLATFORMS_DATA = _freeze(PLATFORMS_DATA)
+
+# Structure-of-arrays view of PLATFORMS_DATA for vectorized scoring:
+# CAPS[i, j] is the level of capability CAP_KEYS[j] for platform PLATFORM_NAMES[i].
+# Levels are 0-3, so the matrix is int8; PLATFORMS_DATA stays the readable source.
+PLATFORM_NAMES = list(PLATFORMS_DATA)
+CAP_KEYS = list(CMS_ONTOLOGY["capabilities"])
+CAPS = np.fromiter(
+    (PLATFORMS_DATA[p]["capabilities"][c] for p in PLATFORM_NAMES for c in CAP_KEYS),
+    dtype=np.int8,
+    count=len(PLATFORM_NAMES) * len(CAP_KEYS)
+).reshape(len(PLATFORM_NAMES), len(CAP_KEYS))
+CAP_IDX = {k: i for i, k in enumerate(CAP_KEYS)}
+
+def _clamp_level(value) -> Optional[int]:
+    """An extracted capability score as a 0-3 level, or None if it isn't numeric."""
+    try:
+        return min(max(round(float(value)), 0), 3)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+# Capability scores pulled in from the Live Data tab replace the defaults.
+# The overrides live in session state because PLATFORMS_DATA is read-only and
+# rebuilt on every rerun; CAPS is only touched when overrides exist.
+for _name, _live_caps in st.session_state.get("capability_overrides", {}).items():
+    if _name in PLATFORMS_DATA:
+        _row = PLATFORM_NAMES.index(_name)
+        for _cap_key, _level in _live_caps.items():
+            if _cap_key in CAP_IDX and isinstance(_level, (int, float)):
+                CAPS[_row, CAP_IDX[_cap_key]] = min(max(round(_level), 0), 3)
+
+# Dense use case requirement matrix: REQUIRED[u, j] is the minimum level of
+# CAP_KEYS[j] for use case UC_KEYS[u] (0 where the capability isn't required)
+UC_KEYS = list(CMS_ONTOLOGY["use_cases"])
+REQUIRED = np.zeros((len(UC_KEYS), len(CAP_KEYS)), dtype=np.int8)
+for _u, _uc_key in enumerate(UC_KEYS):
+    for _cap_key, _level in CMS_ONTOLOGY["use_cases"][_uc_key]["required_capabilities"].items():
+        REQUIRED[_u, CAP_IDX[_cap_key]] = _level
+REQUIRED_COUNTS = np.array(
+    [len(CMS_ONTOLOGY["use_cases"][k]["required_capabilities"]) for k in UC_KEYS],
+    dtype=np.float32
+)
+
+# Default business outcome weights, gathered and checked once at import
+OUTCOME_NAMES = list(CMS_ONTOLOGY["business_outcomes"])
+OUTCOME_W = np.array(
+    [CMS_ONTOLOGY["business_outcomes"][o]["weight"] for o in OUTCOME_NAMES],
+    dtype=np.float32
+)
+assert abs(OUTCOME_W.sum() - 1.0) < 1e-6, "business outcome weights must sum to 1"
+
+# Cache-key salt for scores derived from CAPS; changes only when overrides do
+CAPS_VERSION = _digest(CAPS.tobytes())
+
+# Small integer codes for sorting/filtering; the vocab is for labels only
+CATEGORY_VOCAB = {c: i for i, c in enumerate(sorted({PLATFORMS_DATA[p]["category"] for p in PLATFORM_NAMES}))}
+CATEGORY_CODE = np.array([CATEGORY_VOCAB[PLATFORMS_DATA[p]["category"]] for p in PLATFORM_NAMES], dtype=np.uint8)
+
+# Platform metadata for the Quick Score table (row i is PLATFORM_NAMES[i]);
+# score columns are attached per selection with .assign()
+PLATFORMS_DF = pd.DataFrame({
+    "Platform": PLATFORM_NAMES,
+    "Type": [PLATFORMS_DATA[p]["type"] for p in PLATFORM_NAMES],
+    "Category": np.array(list(CATEGORY_VOCAB))[CATEGORY_CODE],
+    "Cost Band": [PLATFORMS_DATA[p]["cost_band"] for p in PLATFORM_NAMES],
+    "Support": CAPS[:, CAP_IDX["operational"]].astype(int)
+})
+SCORE_TABLE_COLUMNS = [
+    "Platform", "Type", "Category", "Use Case Fit", "Business Fit", "Composite Score",
+    "Cost Band", "Support"
+]
+
+# ============================================================================
+# AI PROMPTS
+# ============================================================================
+
+# Per-platform AI assessment output schema, serialized once for cache keys
+ASSESSMENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "platform": {"type": "string"},
+        "overall_fit_score": {"type": "number"},
+        "strengths": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "weaknesses": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "best_for_use_case": {"type": "string"}
+    },
+    "required": ["platform", "overall_fit_score", "strengths", "weaknesses", "best_for_use_case"]
+}
+ASSESSMENT_SCHEMA_JSON = json.dumps(ASSESSMENT_SCHEMA, sort_keys=True, separators=(",", ":"))
+
+# Tab 4 stack recommendation output schema, serialized once for cache keys
+STACK_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "recommended_stacks": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "fit_score": {"type": "number"},
+                    "components": {"type": "array", "items": {"type": "string"}},
+                    "pros": {"type": "array", "items": {"type": "string"}},
+                    "cons": {"type": "array", "items": {"type": "string"}},
+                    "migration_approach": {"type": "string"},
+                    "timeline_months": {"type": "integer"},
+                    "cost_tier": {"type": "string"},
+                    "best_for": {"type": "string"}
+                }
+            }
+        },
+        "top_recommendation": {"type": "string"},
+        "migration_strategy": {"type": "string"}
+    }
+}
+STACK_SCHEMA_JSON = json.dumps(STACK_SCHEMA, sort_keys=True, separators=(",", ":"))
+
+
+# Display labels for the stack schema's migration_approach values
+MIGRATION_LABELS = {
+    "strangler_fig": "🌿 Strangler Fig (gradual)",
+    "big_bang": "💥 Big Bang (all at once)",
+    "phased": "📦 Phased (batch cutover)"
+}
+
+
+# Per-platform assessment prompt; "$$" is a literal dollar sign
+ASSESSMENT_PROMPT = string.Template("""
+You are evaluating a CMS platform with this SPECIFIC business context:
+
+## BUSINESS CONTEXT (from user input)
+$business_context
+
+## PRIORITY USE CASES:
+$use_case_context
+
+## PLATFORM TO EVALUATE: $platform
+
+Provide:
+
+1. **overall_fit_score** (0.0-1.0): Score based on:
+   - Can it FIX conversion optimization problems? (weight: 30%)
+   - Speed of experimentation/A/B testing (weight: 25%)  
+   - Ability to consolidate legacy systems (weight: 20%)
+   - Future flexibility and composability (weight: 15%)
+   - Total cost of ownership (weight: 10%)
+
+2. **strengths** (exactly 3): Specific capabilities that address the pain points described above.
+   Example: "Native A/B testing allows optimizing CTAs without developer involvement"
+
+3. **weaknesses** (exactly 3): Specific gaps relative to the stated needs.
+   Example: "No built-in personalization requires integrating 3rd party CDP, adding $$50K+ annual cost"
+
+4. **best_for_use_case**: Which use case (paid_landing_pages, enrollment_funnel, multi_property_management, legacy_consolidation) is this platform BEST suited for and WHY in one sentence.
+
+Be brutally honest. Avoid marketing language.
+Return as structured JSON matching the schema provided, with "platform" set to "$platform".
+""")
+
+
+def build_assessment_prompt(platform_name: str, business_context: str, use_case_context: str) -> str:
+    """Build the AI assessment prompt for a single platform."""
+    return ASSESSMENT_PROMPT.substitute(
+        platform=platform_name,
+        business_context=business_context,
+        use_case_context=use_case_context
+    )
+
+
+# Static context first and the use case list last, so provider-side
+# prefix caching still applies when only the selection changes
+STACK_PROMPT = string.Template("""
+Based on CINCH's specific situation, recommend 3 technology stack options:
+
+## CINCH CONTEXT
+- Currently on HubSpot CMS which is FAILING at conversion optimization
+- Operating across 5 legacy CMS: HubSpot, Liferay, Ion (~9yr), Starmark (~9yr), Surefire
+- Need to consolidate to 3 platforms (1 won't work)
+- Traffic: 20K paid views/day, 6-7K unique visitors
+- Primary goal: IMPROVE CONVERSION RATES
+- Avoid: Sitecore (too expensive), Liferay (too lightweight)
+- Considering: Contentful as an option
+
+## AVAILABLE PLATFORMS TO INCLUDE
+$platforms
+
+For each of the 3 stack options, provide:
+1. **name**: Descriptive stack name (e.g., "Headless + CDP Stack")
+2. **fit_score**: 0.0-1.0 based on CINCH's requirements
+3. **components**: List of 3-5 specific technologies (e.g., ["Contentful", "Segment CDP", "Next.js", "HubSpot CRM"])
+4. **pros**: 3 specific benefits addressing HubSpot's failures
+5. **cons**: 2-3 honest drawbacks
+6. **migration_approach**: "strangler_fig", "phased", or "big_bang"
+7. **timeline_months**: Realistic implementation timeline
+8. **cost_tier**: "$$", "$$$$", or "$$$$$$"
+9. **best_for**: Which of CINCH's use cases this stack excels at
+
+Also provide:
+- **top_recommendation**: Which stack you recommend and why (1-2 sentences)
+- **migration_strategy**: Recommended approach to move from 5 CMS to 3 platforms (2-3 sentences)
+
+Be specific to CINCH. Consider their HubSpot pain points.
+
+## PRIORITY USE CASES
+$use_case_list
+
+Return as structured JSON.
+""")
+
+
+def build_stack_prompt(use_case_labels: List[str]) -> str:
+    """Build the Tab 4 stack recommendation prompt for the selected use cases."""
+    return STACK_PROMPT.substitute(
+        platforms=', '.join(PLATFORMS_DATA.keys()),
+        use_case_list='\n'.join('- ' + uc for uc in use_case_labels)
+    )
+
+
+# ============================================================================
+# SCORING
+# ============================================================================
+
+@st.cache_data(show_spinner=False)
+def normalize_weights(weight_values: tuple) -> Dict[str, float]:
+    """Normalize slider values (in OUTCOME_NAMES order) to sum to 1; cached on the values."""
+    w = np.fromiter(weight_values, dtype=np.float64, count=len(OUTCOME_NAMES))
+    w /= w.sum() or 1.0
+    return dict(zip(OUTCOME_NAMES, w.tolist()))
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def quick_score_table(selected_use_cases: tuple, caps_version: str):
+    """
+    Build the ranked Quick Score table for a use case selection.
+    
+    selected_use_cases should be in UC_KEYS order so equivalent selections
+    share a cache entry. caps_version is CAPS_VERSION; it is only part of
+    the cache key, so live data overrides invalidate cached tables.
+    """
+    selected_idx = np.flatnonzero(np.isin(UC_KEYS, selected_use_cases))
+    use_case_fit, business_fit, composite = score_platforms(
+        CAPS, REQUIRED, REQUIRED_COUNTS, selected_idx
+    )
+    
+    # Highest (displayed) composite first; ties keep definition order
+    composite = np.round(composite, 2)
+    order = np.argsort(-composite, kind="stable")
+    
+    scores_df = PLATFORMS_DF.assign(**{
+        "Use Case Fit": np.round(use_case_fit, 2),
+        "Business Fit": np.round(business_fit, 2),
+        "Composite Score": composite
+    })[SCORE_TABLE_COLUMNS].iloc[order].reset_index(drop=True)
+    return scores_df
+
+
+@st.cache_data(show_spinner=False)
+def outcome_weights_table() -> pd.DataFrame:
+    """Business outcome weights with their share of the total (ontology is static)."""
+    return pd.DataFrame({
+        "Outcome": [CMS_ONTOLOGY["business_outcomes"][o]["label"] for o in OUTCOME_NAMES],
+        "Weight": OUTCOME_W.round(2),
+        "Normalized": [f"{w * 100:.1f}%" for w in OUTCOME_W]
+    })
+
+
+# ============================================================================
+# LLM CALLS
+# ============================================================================
+
+@st.cache_resource(show_spinner=False)
+def _get_provider(provider_kind: str, provider_opts: tuple = ()):
+    """Build each provider (and its SDK client) once per config, shared across reruns and sessions."""
+    return get_provider(provider_kind, **dict(provider_opts))
+
+
+# get_provider() options that wrap a provider in a CachingLLMProvider with the
+# same lifetime and size as cached_chat(), for calls that stream their reply
+STREAM_CACHE_OPTS = (("cache", True), ("cache_size", 64), ("cache_ttl", 3600))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def probe_provider(provider_kind: str, provider_opts: tuple = ()) -> bool:
+    """Check provider availability, re-probing at most every 30s."""
+    return _get_provider(provider_kind, provider_opts).is_available()
+
+
+@st.cache_resource(show_spinner=False)
+def _schema(schema_json: str) -> dict:
+    """Parse each schema once and hand out the same dict, so providers can reuse its serialized form."""
+    return json.loads(schema_json)
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def cached_chat(provider_kind: str, provider_opts: tuple, prompt_key: str, schema_json: str, _prompt: str) -> dict:
+    """
+    Single structured chat call, memoized on provider config, prompt and schema.
+    
+    The cache is keyed on prompt_key (_digest() of the prompt) rather than
+    the prompt itself, so Streamlit never re-hashes the full text.
+    """
+    response = _get_provider(provider_kind, provider_opts).chat(_prompt, _schema(schema_json))
+    return response.content
+
+
+def assess_platforms(provider_kind: str, provider_opts: tuple, prompts: tuple, schema_json: str, on_progress=None) -> list:
+    """
+    Run one cached_chat() per prompt concurrently and return the results in prompt order.
+    
+    Each prompt is cached on its own, so a rerun only pays for prompts that
+    changed. on_progress(done, total) is called from the script thread as
+    each call finishes, which keeps Streamlit elements out of the workers.
+    """
+    ctx = get_script_run_ctx()
+    results = [None] * len(prompts)
+    
+    with ThreadPoolExecutor(
+        max_workers=min(5, len(prompts)),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    ) as executor:
+        futures = {
+            executor.submit(
+                cached_chat, provider_kind, provider_opts,
+                _digest(prompt.encode()), schema_json, prompt
+            ): i
+            for i, prompt in enumerate(prompts)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            if on_progress:
+                on_progress(done, len(prompts))
+    
+    return results
+
+# ============================================================================
+# LIVE DATA
+# ============================================================================
+
+LIVE_DATA_VENDORS = ["contentful", "sanity", "hubspot", "sitecore", "acquia"]
+
+
+@st.cache_resource(show_spinner=False)
+def _get_agent(agent_opts: tuple):
+    """
+    Build the (event loop, CMSDataAgent) pair for an Ollama config, once per process.
+    
+    The loop is data_agents' background loop, so every session submits work
+    to the same already-launched Playwright browser via run_coroutine_threadsafe().
+    """
+    loop = background_loop()
+    
+    agent = CMSDataAgent(provider=_get_provider("ollama", agent_opts))
+    asyncio.run_coroutine_threadsafe(agent.start(), loop).result()
+    atexit.register(lambda: asyncio.run_coroutine_threadsafe(agent.close(), loop).result(timeout=10))
+    return loop, agent
+
+
+def get_agent(provider_kind: str, provider_opts: tuple):
+    """
+    Return the shared (event loop, CMSDataAgent) for the sidebar selection.
+    
+    Extraction always runs on Ollama, using the sidebar's model/host when
+    Ollama is the selected provider.
+    """
+    return _get_agent(provider_opts if provider_kind == "ollama" else ())
+
+
+def package_vendor_data(agent, vendor: str, raw_content: str, extracted: Dict):
+    """Save the full scrape and the extracted VendorData to disk, and return the VendorData."""
+    save_raw_content(vendor, raw_content)
+    data = VendorData(
+        platform=vendor,
+        capabilities=extracted.get("capabilities", {}),
+        pricing_info=extracted.get("pricing_tier", "Unknown"),
+        features=extracted.get("key_features", []),
+        source_urls=agent.VENDOR_DOCS.get(vendor.lower(), []),
+        raw_content=raw_content[:RAW_PREVIEW_CHARS]
+    )
+    save_vendor_data(data)
+    return data
+
+
+# ============================================================================
+# REPORT EXPORT
+# ============================================================================
+
+@st.cache_data(show_spinner=False)
+def build_docx_report(selected_use_cases: tuple) -> io.BytesIO:
+    """Build the DOCX report once per use case selection and return the file buffer."""
+    from docx import Document
+    
+    doc = Document()
+    doc.add_heading('Home Warranty CMS Evaluation Report', 0)
+    doc.add_paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    doc.add_heading('Executive Summary', level=1)
+    doc.add_paragraph('The company is evaluating headless and composable CMS solutions to consolidate 5 legacy platforms into 3 unified platforms.')
+    
+    doc.add_heading('Current State', level=1)
+    doc.add_paragraph('• Primary CMS: HubSpot (underperforming)')
+    doc.add_paragraph('• Legacy Systems: Liferay, Ion, Starmark, Surefire')
+    doc.add_paragraph('• Traffic: ~20K paid views/day')
+    
+    doc.add_heading('Selected Use Cases', level=1)
+    for uc in selected_use_cases:
+        doc.add_paragraph(f"• {CMS_ONTOLOGY['use_cases'][uc]['label']}", style='List Bullet')
+    
+    doc.add_heading('Recommendation', level=1)
+    doc.add_paragraph('Pursue a phased migration using the Strangler Fig pattern.')
+    
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def build_pptx_report(custom_context: str, use_case_labels: List[str], stack_recs: Dict) -> io.BytesIO:
+    """Build the PPTX deck from the business context and AI stack recommendations."""
+    from pptx import Presentation
+    
+    prs = Presentation()
+    
+    # Slide 1: Title
+    slide = prs.slides.add_slide(prs.slide_layouts[0])
+    slide.shapes.title.text = "CMS Evaluation Report"
+    slide.placeholders[1].text = f"Home Warranty Company | {datetime.now().strftime('%B %Y')}"
+    
+    # Slide 2: Business Context (from user input)
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = "Business Context"
+    tf = slide.placeholders[1].text_frame
+    context_lines = custom_context.split('\n')[:6]  # First 6 lines
+    tf.text = context_lines[0] if context_lines else "CMS evaluation in progress"
+    for line in context_lines[1:]:
+        if line.strip():
+            p = tf.add_paragraph()
+            p.text = line.strip()
+    
+    # Slide 3: Selected Use Cases
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = "Priority Use Cases"
+    tf = slide.placeholders[1].text_frame
+    tf.text = use_case_labels[0] if use_case_labels else "No use cases selected"
+    for uc in use_case_labels[1:]:
+        p = tf.add_paragraph()
+        p.text = f"• {uc}"
+    
+    # Slide 4: Top Recommendation
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = "🏆 Top Recommendation"
+    tf = slide.placeholders[1].text_frame
+    tf.text = stack_recs.get('top_recommendation', 'Run AI analysis for recommendations')
+    if 'migration_strategy' in stack_recs:
+        p = tf.add_paragraph()
+        p.text = ""
+        p = tf.add_paragraph()
+        p.text = f"Migration Strategy: {stack_recs['migration_strategy']}"
+    
+    # Slides for each stack option
+    for i, stack in enumerate(stack_recs.get('recommended_stacks', [])[:3]):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Option {chr(65+i)}: {stack.get('name', 'Stack')}"
+        tf = slide.placeholders[1].text_frame
+        
+        tf.text = f"Fit Score: {stack.get('fit_score', 0):.2f} | Cost: {stack.get('cost_tier', '$$')} | Timeline: {stack.get('timeline_months', '?')} months"
+        
+        p = tf.add_paragraph()
+        p.text = f"Components: {', '.join(stack.get('components', []))}"
+        
+        p = tf.add_paragraph()
+        p.text = ""
+        p = tf.add_paragraph()
+        p.text = "✅ Pros:"
+        for pro in stack.get('pros', [])[:3]:
+            p = tf.add_paragraph()
+            p.text = f"   • {pro}"
+        
+        p = tf.add_paragraph()
+        p.text = "❌ Cons:"
+        for con in stack.get('cons', [])[:2]:
+            p = tf.add_paragraph()
+            p.text = f"   • {con}"
+    
+    # Final slide: Next Steps
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = "Next Steps"
+    tf = slide.placeholders[1].text_frame
+    tf.text = "1. Schedule vendor demos for top recommended platforms"
+    p = tf.add_paragraph()
+    p.text = "2. Run proof-of-concept on 2-3 high-traffic pages"
+    p = tf.add_paragraph()
+    p.text = "3. Calculate detailed TCO for final 2 options"
+    p = tf.add_paragraph()
+    p.text = "4. Build migration roadmap with IT team"
+    
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def build_pdf_report() -> io.BytesIO:
+    """Build the PDF summary as Platypus flowables, laid out and paginated in one build()."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer, pagesize=letter,
+        leftMargin=1*inch, rightMargin=1*inch, topMargin=1*inch, bottomMargin=1*inch
+    )
+    styles = getSampleStyleSheet()
+    
+    def section(title: str, lines: List[str]) -> list:
+        return [
+            Spacer(1, 0.3*inch),
+            Paragraph(title, styles['Heading2']),
+            *[Paragraph(line, styles['BodyText']) for line in lines]
+        ]
+    
+    story = [
+        Paragraph("Home Warranty CMS Evaluation Report", styles['Title']),
+        Paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']),
+        *section("Executive Summary", [
+            "Consolidating 5 CMS platforms to 3 unified platforms.",
+            "Primary goal: Improve conversion rates by 10%+",
+            "Traffic: ~20,000 paid views/day"
+        ]),
+        *section("Key Findings", [
+            "<bullet>&bull;</bullet>Best overall: Composable CMS + HubSpot CRM",
+            "<bullet>&bull;</bullet>Best headless: Contentful",
+            "<bullet>&bull;</bullet>Best quick wins: HubSpot + Headless hybrid"
+        ]),
+        *section("Recommendation", [
+            "Pursue phased migration using Strangler Fig pattern"
+        ])
+    ]
+    
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+
+def build_exports(selected_use_cases: tuple, custom_context: str, stack_recs: Dict) -> Dict[str, Any]:
+    """
+    Build every available export format concurrently.
+    
+    Returns {"docx" | "pptx" | "pdf": BytesIO or Exception}. A format is left
+    out when its library is missing, and PPTX is skipped until there are
+    stack recommendations to put in it.
+    """
+    use_case_labels = [CMS_ONTOLOGY['use_cases'][uc]['label'] for uc in selected_use_cases]
+    builders = {}
+    if DOCX_AVAILABLE:
+        builders["docx"] = lambda: build_docx_report(selected_use_cases)
+    if PPTX_AVAILABLE and stack_recs:
+        builders["pptx"] = lambda: build_pptx_report(custom_context, use_case_labels, stack_recs)
+    if PDF_AVAILABLE:
+        builders["pdf"] = build_pdf_report
+    if not builders:
+        return {}
+    
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=len(builders),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    ) as executor:
+        futures = {fmt: executor.submit(build) for fmt, build in builders.items()}
+    
+    return {fmt: future.exception() or future.result() for fmt, future in futures.items()}
+
+
+@st.cache_resource(show_spinner=False)
+def _warm_report_imports() -> threading.Thread:
+    """Import the export backends on a daemon thread, once per process, so the first export finds them loaded."""
+    def warm():
+        for module in ("docx", "pptx", "reportlab.platypus", "reportlab.lib.styles"):
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                pass
+    
+    thread = threading.Thread(target=warm, name="report-import-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
 # ============================================================================
 # STREAMLIT UI
 # ============================================================================
 
 st.set_page_config(page_title="Home Warranty CMS Evaluation", layout="wide", initial_sidebar_state="expanded")
+_warm_report_imports()
 
 st.title("🎯 Home Warranty CMS Evaluation Framework")
 st.markdown("**Interactive tool to evaluate and score CMS platforms for consolidation strategy**")
@@ -281,21 +921,19 @@ with st.sidebar:
     st.markdown("---")
     st.subheader("Business Driver Weights")
     
-    weights = {}
+    weight_values = []
     for outcome_key, outcome in CMS_ONTOLOGY["business_outcomes"].items():
-        weights[outcome_key] = st.slider(
+        weight_values.append(st.slider(
             outcome["label"],
             min_value=0.0,
             max_value=1.0,
             value=outcome["weight"],
             step=0.05,
             key=f"weight_{outcome_key}"
-        )
+        ))
     
     # Normalize weights
-    total_weight = sum(weights.values())
-    if total_weight > 0:
-        weights = {k: v / total_weight for k, v in weights.items()}
+    weights = normalize_weights(tuple(weight_values))
     
     st.markdown("---")
     
@@ -306,6 +944,7 @@ with st.sidebar:
     )
     
     # Provider selection (only show if AI analysis selected)
+    provider_kind, provider_opts = None, ()
     if eval_method == "AI-Powered Analysis":
         st.markdown("---")
         st.subheader("🤖 LLM Provider")
@@ -327,26 +966,25 @@ with st.sidebar:
                 value="http://localhost:11444",
                 help="Ollama server URL"
             )
+            provider_kind, provider_opts = "ollama", (("model", ollama_model), ("host", ollama_host))
             # Check availability
             try:
-                test_provider = OllamaProvider(model=ollama_model, host=ollama_host)
-                if test_provider.is_available():
+                if probe_provider(provider_kind, provider_opts):
                     st.success(f"✅ Connected to Ollama")
                 else:
                     st.warning("⚠️ Ollama running but model may need to be pulled")
             except Exception:
                 st.error("❌ Cannot connect to Ollama. Is it running?")
         elif provider_type == "OpenAI (Cloud)":
-            from llm_providers import OpenAIProvider
-            test_provider = OpenAIProvider()
-            if test_provider.is_available():
+            provider_kind = "openai"
+            if probe_provider(provider_kind):
                 st.success("✅ OpenAI API key configured")
             else:
                 st.warning("⚠️ Set OPENAI_API_KEY in Streamlit secrets or environment")
         else:
+            provider_kind = "anthropic"
             # Check Claude availability
-            test_provider = AnthropicProvider()
-            if test_provider.is_available():
+            if probe_provider(provider_kind):
                 st.success("✅ Claude API key configured")
             else:
                 st.warning("⚠️ Set ANTHROPIC_API_KEY environment variable")
@@ -391,61 +1029,32 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Platform Scores", "🌐 Live Data"
 # TAB 1: Platform Scores
 # ─────────────────────────────────────────────────────────────────────────────
 
-with tab1:
+@st.fragment
+def render_scores_tab(eval_method: str, selected_use_cases: List[str], provider_kind: str, provider_opts: tuple):
+    """Tab 1 body; runs as a fragment so its own widgets don't rerun the other tabs."""
     st.header("Platform Capability Scores")
     
     if eval_method == "Quick Score (Local)":
         st.info("Using pre-populated capability scores. Adjust in sidebar to see impact.")
         
-        # Calculate composite scores
-        scores_df = []
-        for platform_name, platform_data in PLATFORMS_DATA.items():
-            capability_scores = platform_data["capabilities"]
-            
-            # Weighted score across selected use cases
-            use_case_fit = 0
-            for uc_key in selected_use_cases:
-                uc_data = CMS_ONTOLOGY["use_cases"][uc_key]
-                uc_score = 0
-                count = 0
-                for cap_key, required_level in uc_data["required_capabilities"].items():
-                    actual_level = capability_scores.get(cap_key, 0)
-                    uc_score += (actual_level / required_level) if required_level > 0 else 0
-                    count += 1
-                use_case_fit += (uc_score / count) if count > 0 else 0
-            
-            use_case_fit = (use_case_fit / len(selected_use_cases)) if selected_use_cases else 0
-            
-            # Business outcome fit (simplified: average capabilities)
-            avg_capability = sum(capability_scores.values()) / len(capability_scores)
-            business_fit = min(avg_capability / 3.0, 1.0)  # Normalize to 0-1
-            
-            composite_score = (use_case_fit * 0.6 + business_fit * 0.4)
-            
-            scores_df.append({
-                "Platform": platform_name,
-                "Type": platform_data["type"],
-                "Category": platform_data["category"],
-                "Use Case Fit": round(use_case_fit, 2),
-                "Business Fit": round(business_fit, 2),
-                "Composite Score": round(composite_score, 2),
-                "Cost Band": platform_data["cost_band"],
-                "Support": platform_data["capabilities"]["operational"]
-            })
-        
-        scores_df = pd.DataFrame(scores_df).sort_values("Composite Score", ascending=False)
+        # Use case fit (averaged across selected use cases), business fit and
+        # composite for every platform, cached per selection
+        selected = tuple(np.asarray(UC_KEYS)[np.isin(UC_KEYS, selected_use_cases)].tolist())
+        scores_df = quick_score_table(selected, CAPS_VERSION)
         
         # Display in columns
         col1, col2 = st.columns([2, 1])
         
         with col1:
             st.dataframe(
-                scores_df.style.format({
-                    "Use Case Fit": "{:.2f}",
-                    "Business Fit": "{:.2f}",
-                    "Composite Score": "{:.2f}"
-                }).highlight_max(subset=["Composite Score"], color="lightgreen"),
-                use_container_width=True
+                scores_df,
+                column_config={
+                    "Use Case Fit": st.column_config.NumberColumn(format="%.2f"),
+                    "Business Fit": st.column_config.NumberColumn(format="%.2f"),
+                    "Composite Score": st.column_config.ProgressColumn(format="%.2f", min_value=0, max_value=1)
+                },
+                use_container_width=True,
+                hide_index=True
             )
         
         with col2:
@@ -458,113 +1067,90 @@ with tab1:
                 )
     
     else:  # AI-Powered Analysis
-        # Get provider based on sidebar selection
-        if provider_type == "Ollama (Local)":
-            provider = get_provider("ollama", model=ollama_model, host=ollama_host)
-        elif provider_type == "OpenAI (Cloud)":
-            provider = get_provider("openai")
-        else:  # Claude
-            provider = get_provider("anthropic")
+        provider = _get_provider(provider_kind, provider_opts)
         st.info(f"🤖 Using {provider.name} for structured assessments...")
         
         if st.button("Run AI Analysis"):
-            with st.spinner(f"Analyzing with {provider.name}..."):
-                try:
-                    assessment_schema = {
-                        "type": "object",
-                        "properties": {
-                            "platform": {"type": "string"},
-                            "overall_fit_score": {"type": "number"},
-                            "strengths": {
-                                "type": "array",
-                                "items": {"type": "string"}
-                            },
-                            "weaknesses": {
-                                "type": "array",
-                                "items": {"type": "string"}
-                            },
-                            "best_for_use_case": {"type": "string"}
-                        },
-                        "required": ["platform", "overall_fit_score", "strengths", "weaknesses", "best_for_use_case"]
-                    }
-                    
-                    # Build use case context from selection
-                    use_case_context = "\n".join([
-                        f"- {CMS_ONTOLOGY['use_cases'][uc]['label']}"
-                        for uc in selected_use_cases
-                    ])
-                    
-                    # Get custom context from session state if available
-                    business_context = st.session_state.get('custom_context', """The company is currently using HubSpot for CMS, which is essentially a CRM with an added CMS module.
+            try:
+                # Build use case context from selection
+                use_case_context = "\n".join([
+                    f"- {CMS_ONTOLOGY['use_cases'][uc]['label']}"
+                    for uc in selected_use_cases
+                ])
+                
+                # Get custom context from session state if available
+                business_context = st.session_state.get('custom_context', """The company is currently using HubSpot for CMS, which is essentially a CRM with an added CMS module.
 HubSpot is NOT meeting expectations for improving conversions and driving enrollments - this is the PRIMARY pain point.
 Currently operating across FIVE different content management systems.""")
-                    
-                    prompt = f"""
-You are evaluating CMS platforms with this SPECIFIC business context:
-
-## BUSINESS CONTEXT (from user input)
-{business_context}
-
-## PRIORITY USE CASES:
-{use_case_context}
-
-## PLATFORMS TO EVALUATE: {', '.join(PLATFORMS_DATA.keys())}
-
-For each platform, provide:
-
-1. **overall_fit_score** (0.0-1.0): Score based on:
-   - Can it FIX conversion optimization problems? (weight: 30%)
-   - Speed of experimentation/A/B testing (weight: 25%)  
-   - Ability to consolidate legacy systems (weight: 20%)
-   - Future flexibility and composability (weight: 15%)
-   - Total cost of ownership (weight: 10%)
-
-2. **strengths** (exactly 3): Specific capabilities that address the pain points described above.
-   Example: "Native A/B testing allows optimizing CTAs without developer involvement"
-
-3. **weaknesses** (exactly 3): Specific gaps relative to the stated needs.
-   Example: "No built-in personalization requires integrating 3rd party CDP, adding $50K+ annual cost"
+                
+                prompts = tuple(
+                    build_assessment_prompt(p, business_context, use_case_context)
+                    for p in PLATFORMS_DATA
+                )
+                
+                progress = st.progress(0, text=f"Analyzing with {provider.name}...")
+                assessments = assess_platforms(
+                    provider_kind,
+                    provider_opts,
+                    prompts,
+                    ASSESSMENT_SCHEMA_JSON,
+                    on_progress=lambda done, total: progress.progress(
+                        done / total, text=f"Assessed {done}/{total} platforms..."
+                    )
+                )
+                progress.empty()
+                
+                st.success(f"✅ AI Analysis Complete (via {provider.name})")
+                st.dataframe(
+                    pd.json_normalize(assessments),
+                    column_config={
+                        "platform": st.column_config.TextColumn("Platform"),
+                        "overall_fit_score": st.column_config.ProgressColumn("Overall Fit", format="%.2f", min_value=0, max_value=1),
+                        "strengths": st.column_config.ListColumn("Strengths"),
+                        "weaknesses": st.column_config.ListColumn("Weaknesses"),
+                        "best_for_use_case": st.column_config.TextColumn("Best For")
+                    },
+                    use_container_width=True,
+                    hide_index=True
+                )
+                with st.expander("Raw JSON"):
+                    st.json(assessments, expanded=False)
+                
+            except Exception as e:
+                st.error(f"Error calling {provider.name}: {e}")
+                if provider_kind == "ollama":
+                    st.info("💡 Tip: Make sure Ollama is running (`ollama serve`) and the model is pulled (`ollama pull " + dict(provider_opts)["model"] + "`).")
+                elif provider_kind == "openai":
+                    st.info("💡 Tip: Make sure your OPENAI_API_KEY is set in Streamlit secrets or as an environment variable.")
+                else:
+                    st.info("💡 Tip: Make sure your ANTHROPIC_API_KEY is set as an environment variable.")
 
-4. **best_for_use_case**: Which use case (paid_landing_pages, enrollment_funnel, multi_property_management, legacy_consolidation) is this platform BEST suited for and WHY in one sentence.
 
-Be brutally honest. Avoid marketing language.
-Return as structured JSON matching the schema provided.
-"""
-                    
-                    response = provider.chat(prompt, assessment_schema)
-                    assessments = response.content
-                    
-                    st.success(f"✅ AI Analysis Complete (via {response.provider})")
-                    st.json(assessments)
-                    
-                except Exception as e:
-                    st.error(f"Error calling {provider.name}: {e}")
-                    if provider_type == "Ollama (Local)":
-                        st.info("💡 Tip: Make sure Ollama is running (`ollama serve`) and the model is pulled (`ollama pull " + ollama_model + "`).")
-                    elif provider_type == "OpenAI (Cloud)":
-                        st.info("💡 Tip: Make sure your OPENAI_API_KEY is set in Streamlit secrets or as an environment variable.")
-                    else:
-                        st.info("💡 Tip: Make sure your ANTHROPIC_API_KEY is set as an environment variable.")
+with tab1:
+    render_scores_tab(eval_method, selected_use_cases, provider_kind, provider_opts)
 
 # ─────────────────────────────────────────────────────────────────────────────
 # TAB 2: Live Data Fetching
 # ─────────────────────────────────────────────────────────────────────────────
 
-with tab2:
+@st.fragment
+def render_live_data_tab(provider_kind: str, provider_opts: tuple):
+    """Tab 2 body; runs as a fragment so fetches don't rerun the other tabs."""
     st.header("🌐 Fetch Live Vendor Data")
     st.markdown("**Scrape real vendor documentation and extract capabilities using AI**")
     
-    # Initialize session state for fetched data
+    # Initialize session state with any vendor data saved in the last day
     if 'live_vendor_data' not in st.session_state:
-        st.session_state.live_vendor_data = {}
+        st.session_state.live_vendor_data = load_cached_vendor_data()
     
-    col1, col2 = st.columns([2, 1])
+    col1, col2, col3 = st.columns([2, 1, 1])
     
     with col1:
-        vendor_to_fetch = st.selectbox(
-            "Select vendor to fetch:",
-            options=["contentful", "sanity", "hubspot", "sitecore", "acquia"],
-            help="Choose a vendor to scrape documentation from"
+        vendors_to_fetch = st.multiselect(
+            "Select vendors to fetch:",
+            options=LIVE_DATA_VENDORS,
+            default=LIVE_DATA_VENDORS[:1],
+            help="Choose vendors to scrape documentation from"
         )
     
     with col2:
@@ -572,10 +1158,20 @@ with tab2:
         st.write("")  # Spacer
         fetch_button = st.button("🔍 Fetch Live Data", type="primary")
     
-    if fetch_button:
+    with col3:
+        st.write("")  # Spacer
+        st.write("")  # Spacer
+        fetch_all_button = st.button("🌐 Fetch All", help="Scrape every vendor concurrently")
+    
+    if fetch_all_button:
+        vendors_to_fetch = LIVE_DATA_VENDORS
+    
+    if fetch_button and not vendors_to_fetch:
+        st.warning("Select at least one vendor to fetch.")
+    
+    elif fetch_button and len(vendors_to_fetch) == 1:
+        vendor_to_fetch = vendors_to_fetch[0]
         try:
-            from data_agents import CMSDataAgent
-            
             # Progress bar with steps
             progress = st.progress(0, text="Initializing...")
             status = st.empty()
@@ -584,38 +1180,29 @@ with tab2:
             status.info("🚀 Starting browser...")
             progress.progress(10, text="Launching Playwright browser...")
             
-            # Get provider
-            if eval_method == "AI-Powered Analysis" and provider_type == "Ollama (Local)":
-                agent_provider = get_provider("ollama", model=ollama_model, host=ollama_host)
-            else:
-                agent_provider = get_provider("ollama")
-            
-            agent = CMSDataAgent(provider=agent_provider)
+            loop, agent = get_agent(provider_kind, provider_opts)
             
             # Step 2: Scrape
             progress.progress(25, text=f"Scraping {vendor_to_fetch} documentation...")
             status.info(f"🌐 Scraping {vendor_to_fetch} website...")
             
-            raw_content = asyncio.run(agent.scrape_vendor(vendor_to_fetch))
+            raw_content = asyncio.run_coroutine_threadsafe(agent.scrape_vendor(vendor_to_fetch), loop).result()
             
-            # Step 3: AI Extraction
+            # Step 3: AI Extraction, streamed so output shows up as it's generated
             progress.progress(60, text="AI extracting capabilities (this takes ~30s)...")
             status.info("🤖 Ollama analyzing content...")
             
-            extracted = agent.extract_capabilities(vendor_to_fetch, raw_content)
+            with st.expander("Model output", expanded=False):
+                extracted_json = st.write_stream(agent.llm.stream_chat(
+                    agent.build_extraction_prompt(vendor_to_fetch, raw_content),
+                    agent.EXTRACTION_SCHEMA
+                ))
+            extracted = json.loads(extracted_json)
             
             # Step 4: Package results
             progress.progress(90, text="Packaging results...")
             
-            from data_agents import VendorData
-            data = VendorData(
-                platform=vendor_to_fetch,
-                capabilities=extracted.get("capabilities", {}),
-                pricing_info=extracted.get("pricing_tier", "Unknown"),
-                features=extracted.get("key_features", []),
-                source_urls=agent.VENDOR_DOCS.get(vendor_to_fetch.lower(), []),
-                raw_content=raw_content[:5000]
-            )
+            data = package_vendor_data(agent, vendor_to_fetch, raw_content, extracted)
             
             # Done
             progress.progress(100, text="✅ Complete!")
@@ -624,8 +1211,34 @@ with tab2:
             # Store in session state
             st.session_state.live_vendor_data[vendor_to_fetch] = data
             
-            # Cleanup
-            asyncio.run(agent.close())
+        except Exception as e:
+            st.error(f"Error fetching data: {e}")
+            st.info("💡 Make sure Ollama is running and Playwright browsers are installed.")
+    
+    elif fetch_button or fetch_all_button:
+        try:
+            loop, agent = get_agent(provider_kind, provider_opts)
+            
+            # Scrape and extract every vendor concurrently on the agent's loop
+            # (the agent caps concurrent scrapes); record each as it finishes
+            async def fetch_one(vendor):
+                raw_content = await agent.scrape_vendor(vendor)
+                extracted = await agent.aextract_capabilities(vendor, raw_content)
+                return raw_content, extracted
+            
+            futures = {
+                asyncio.run_coroutine_threadsafe(fetch_one(v), loop): v
+                for v in vendors_to_fetch
+            }
+            progress = st.progress(0, text=f"🌐 Fetching {len(futures)} vendors...")
+            for done, future in enumerate(as_completed(futures), start=1):
+                vendor = futures[future]
+                try:
+                    raw_content, extracted = future.result()
+                    st.session_state.live_vendor_data[vendor] = package_vendor_data(agent, vendor, raw_content, extracted)
+                except Exception as e:
+                    st.warning(f"Could not fetch {vendor}: {e}")
+                progress.progress(done / len(futures), text=f"✅ {done}/{len(futures)} vendors done ({vendor})")
             
         except Exception as e:
             st.error(f"Error fetching data: {e}")
@@ -642,10 +1255,10 @@ with tab2:
                 
                 with col1:
                     st.markdown("**Capabilities (0-3):**")
-                    caps_df = pd.DataFrame([
-                        {"Capability": k.replace("_", " ").title(), "Score": v}
-                        for k, v in data.capabilities.items()
-                    ])
+                    caps_df = pd.DataFrame({
+                        "Capability": [k.replace("_", " ").title() for k in data.capabilities],
+                        "Score": list(data.capabilities.values())
+                    })
                     st.dataframe(caps_df, use_container_width=True, hide_index=True)
                 
                 with col2:
@@ -657,18 +1270,28 @@ with tab2:
         
         # Option to use live data in scoring
         if st.button("📥 Use Live Data in Platform Scores"):
+            overrides = st.session_state.setdefault("capability_overrides", {})
             for vendor, data in st.session_state.live_vendor_data.items():
                 vendor_key = vendor.title()
                 if vendor_key in PLATFORMS_DATA:
-                    PLATFORMS_DATA[vendor_key]["capabilities"] = data.capabilities
-                    st.success(f"Updated {vendor_key} with live data!")
-            st.info("👈 Switch to 'Platform Scores' tab to see updated rankings.")
+                    levels = {k: _clamp_level(v) for k, v in data.capabilities.items()}
+                    overrides[vendor_key] = {k: v for k, v in levels.items() if v is not None}
+                    st.toast(f"Updated {vendor_key} with live data!")
+            st.toast("👈 Switch to 'Platform Scores' tab to see updated rankings.")
+            # Rerun so the capability matrix is rebuilt with the overrides
+            st.rerun()
+
+
+with tab2:
+    render_live_data_tab(provider_kind, provider_opts)
 
 # ─────────────────────────────────────────────────────────────────────────────
 # TAB 3: Ontology Browser
 # ─────────────────────────────────────────────────────────────────────────────
 
-with tab3:
+@st.fragment
+def render_ontology_tab():
+    """Tab 3 body; runs as a fragment so switching views doesn't rerun the other tabs."""
     st.header("CMS Ontology")
     st.markdown("**Structured capability model used for evaluation**")
     
@@ -691,15 +1314,11 @@ with tab3:
                     st.write(f"  • {cap_name}: Level {level}/3")
     
     else:  # Business Outcomes
-        outcome_weights_df = pd.DataFrame([
-            {
-                "Outcome": outcome["label"],
-                "Weight": outcome["weight"],
-                "Normalized": f"{(outcome['weight'] / sum(o['weight'] for o in CMS_ONTOLOGY['business_outcomes'].values())) * 100:.1f}%"
-            }
-            for outcome in CMS_ONTOLOGY["business_outcomes"].values()
-        ])
-        st.dataframe(outcome_weights_df, use_container_width=True)
+        st.dataframe(outcome_weights_table(), use_container_width=True)
+
+
+with tab3:
+    render_ontology_tab()
 
 # ─────────────────────────────────────────────────────────────────────────────
 # TAB 4: AI-Driven Recommended Stacks
@@ -713,95 +1332,32 @@ with tab4:
     if 'stack_recommendations' not in st.session_state:
         st.session_state.stack_recommendations = None
     
-    # Get provider type - default to OpenAI if not in AI mode
-    current_provider = provider_type if 'provider_type' in dir() else "OpenAI (Cloud)"
-    st.info(f"🤖 Using {current_provider} for stack recommendations")
+    # Sidebar provider, defaulting to OpenAI when not in AI mode
+    stack_kind = provider_kind or "openai"
+    st.info(f"🤖 Using {_get_provider(stack_kind, provider_opts).name} for stack recommendations")
     
     if st.button("🚀 Generate AI Stack Recommendations", type="primary"):
         with st.spinner("Analyzing optimal technology stacks..."):
             try:
-                # Get provider based on sidebar selection
-                if 'provider_type' in dir() and provider_type == "Ollama (Local)":
-                    stack_provider = get_provider("ollama", model=ollama_model, host=ollama_host)
-                elif 'provider_type' in dir() and provider_type == "OpenAI (Cloud)":
-                    stack_provider = get_provider("openai")
-                elif 'provider_type' in dir():
-                    stack_provider = get_provider("anthropic")
-                else:
-                    stack_provider = get_provider("openai")  # Default
-                
-                stack_schema = {
-                    "type": "object",
-                    "properties": {
-                        "recommended_stacks": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "name": {"type": "string"},
-                                    "fit_score": {"type": "number"},
-                                    "components": {"type": "array", "items": {"type": "string"}},
-                                    "pros": {"type": "array", "items": {"type": "string"}},
-                                    "cons": {"type": "array", "items": {"type": "string"}},
-                                    "migration_approach": {"type": "string"},
-                                    "timeline_months": {"type": "integer"},
-                                    "cost_tier": {"type": "string"},
-                                    "best_for": {"type": "string"}
-                                }
-                            }
-                        },
-                        "top_recommendation": {"type": "string"},
-                        "migration_strategy": {"type": "string"}
-                    }
-                }
-                
                 # Build use case context
                 use_case_labels = [CMS_ONTOLOGY['use_cases'][uc]['label'] for uc in selected_use_cases]
                 
-                stack_prompt = f"""
-Based on CINCH's specific situation, recommend 3 technology stack options:
-
-## CINCH CONTEXT
-- Currently on HubSpot CMS which is FAILING at conversion optimization
-- Operating across 5 legacy CMS: HubSpot, Liferay, Ion (~9yr), Starmark (~9yr), Surefire
-- Need to consolidate to 3 platforms (1 won't work)
-- Traffic: 20K paid views/day, 6-7K unique visitors
-- Primary goal: IMPROVE CONVERSION RATES
-- Avoid: Sitecore (too expensive), Liferay (too lightweight)
-- Considering: Contentful as an option
-
-## PRIORITY USE CASES
-{chr(10).join(['- ' + uc for uc in use_case_labels])}
-
-## AVAILABLE PLATFORMS TO INCLUDE
-{', '.join(PLATFORMS_DATA.keys())}
-
-For each of the 3 stack options, provide:
-1. **name**: Descriptive stack name (e.g., "Headless + CDP Stack")
-2. **fit_score**: 0.0-1.0 based on CINCH's requirements
-3. **components**: List of 3-5 specific technologies (e.g., ["Contentful", "Segment CDP", "Next.js", "HubSpot CRM"])
-4. **pros**: 3 specific benefits addressing HubSpot's failures
-5. **cons**: 2-3 honest drawbacks
-6. **migration_approach**: "strangler_fig", "phased", or "big_bang"
-7. **timeline_months**: Realistic implementation timeline
-8. **cost_tier**: "$", "$$", or "$$$"
-9. **best_for**: Which of CINCH's use cases this stack excels at
-
-Also provide:
-- **top_recommendation**: Which stack you recommend and why (1-2 sentences)
-- **migration_strategy**: Recommended approach to move from 5 CMS to 3 platforms (2-3 sentences)
-
-Be specific to CINCH. Consider their HubSpot pain points.
-Return as structured JSON.
-"""
+                stack_prompt = build_stack_prompt(use_case_labels)
                 
-                response = stack_provider.chat(stack_prompt, stack_schema)
-                st.session_state.stack_recommendations = response.content
+                # Stream the reply so output shows up as it's generated. The caching
+                # provider is shared across sessions: a repeat prompt replays the
+                # stored reply, a new one is streamed and stored once complete.
+                stack_provider = _get_provider(stack_kind, provider_opts + STREAM_CACHE_OPTS)
+                with st.expander("Model output", expanded=False):
+                    stack_json = st.write_stream(
+                        stack_provider.stream_chat(stack_prompt, _schema(STACK_SCHEMA_JSON))
+                    )
+                st.session_state.stack_recommendations = json.loads(stack_json)
                 st.success("✅ Stack recommendations generated!")
                 
             except Exception as e:
                 st.error(f"Error generating recommendations: {e}")
-                if provider_type == "OpenAI (Cloud)":
+                if stack_kind == "openai":
                     st.info("💡 Tip: Make sure your OPENAI_API_KEY is set in Streamlit secrets.")
     
     # Display recommendations if available
@@ -817,44 +1373,34 @@ Return as structured JSON.
         
         st.markdown("---")
         
-        # Display each stack
-        for i, stack in enumerate(recs.get("recommended_stacks", [])[:3]):
-            st.markdown(f"### Option {chr(65+i)}: {stack.get('name', 'Stack ' + str(i+1))}")
-            
-            col1, col2, col3 = st.columns([2, 1, 1])
-            
-            with col1:
-                st.markdown("**Components:**")
-                for comp in stack.get("components", []):
-                    st.write(f"  • {comp}")
-                
-                st.markdown("**Pros:**")
-                for pro in stack.get("pros", []):
-                    st.write(f"  ✅ {pro}")
-                
-                st.markdown("**Cons:**")
-                for con in stack.get("cons", []):
-                    st.write(f"  ❌ {con}")
-            
-            with col2:
-                st.metric("Fit Score", f"{stack.get('fit_score', 0):.2f}")
-                st.metric("Timeline", f"{stack.get('timeline_months', '?')} months")
-                st.metric("Cost Tier", stack.get("cost_tier", "$$"))
-            
-            with col3:
-                st.markdown("**Migration:**")
-                approach = stack.get("migration_approach", "phased")
-                if approach == "strangler_fig":
-                    st.write("🌿 Strangler Fig (gradual)")
-                elif approach == "big_bang":
-                    st.write("💥 Big Bang (all at once)")
-                else:
-                    st.write("📦 Phased (batch cutover)")
-                
-                st.markdown("**Best For:**")
-                st.write(stack.get("best_for", "General use"))
-            
-            st.markdown("---")
+        # All stacks in one table; list fields render as chips
+        stacks_df = pd.DataFrame(recs.get("recommended_stacks", [])[:3])
+        if not stacks_df.empty:
+            stacks_df.insert(0, "option", [f"Option {chr(65 + i)}" for i in range(len(stacks_df))])
+            if "migration_approach" in stacks_df:
+                stacks_df["migration_approach"] = stacks_df["migration_approach"].map(
+                    lambda approach: MIGRATION_LABELS.get(approach, MIGRATION_LABELS["phased"])
+                )
+            st.dataframe(
+                stacks_df,
+                column_config={
+                    "option": st.column_config.TextColumn("Option"),
+                    "name": st.column_config.TextColumn("Stack"),
+                    "fit_score": st.column_config.ProgressColumn("Fit Score", format="%.2f", min_value=0, max_value=1),
+                    "components": st.column_config.ListColumn("Components"),
+                    "pros": st.column_config.ListColumn("Pros"),
+                    "cons": st.column_config.ListColumn("Cons"),
+                    "migration_approach": st.column_config.TextColumn("Migration"),
+                    "timeline_months": st.column_config.NumberColumn("Timeline", format="%d months"),
+                    "cost_tier": st.column_config.TextColumn("Cost Tier"),
+                    "best_for": st.column_config.TextColumn("Best For")
+                },
+                use_container_width=True,
+                hide_index=True
+            )
+        
+        with st.expander("Raw JSON"):
+            st.json(recs, expanded=False)
     else:
         st.info("👆 Click the button above to generate AI-powered stack recommendations based on your specific requirements.")
 
@@ -862,7 +1408,9 @@ Return as structured JSON.
 # TAB 5: Report & Export
 # ─────────────────────────────────────────────────────────────────────────────
 
-with tab5:
+@st.fragment
+def render_report_tab(selected_use_cases: List[str]):
+    """Tab 5 body; runs as a fragment so export clicks don't rerun the other tabs."""
     st.header("📄 Evaluation Report & Export")
     
     # Get dynamic content from session state
@@ -938,197 +1486,65 @@ with tab5:
     st.markdown("---")
     st.subheader("📥 Export Options")
     
+    # All formats are built together on request and served until the report content changes
+    exports_key = (tuple(selected_use_cases), custom_context, json.dumps(stack_recs, sort_keys=True))
+    if st.button("⚙️ Prepare Exports", disabled=not (DOCX_AVAILABLE or PPTX_AVAILABLE or PDF_AVAILABLE)):
+        with st.spinner("Preparing exports..."):
+            # Let the background warm-up finish rather than import the backends twice at once
+            _warm_report_imports().join()
+            st.session_state.exports = build_exports(tuple(selected_use_cases), custom_context, stack_recs)
+        st.session_state.exports_key = exports_key
+    if st.session_state.get('exports_key') == exports_key:
+        exports = st.session_state.exports
+    else:
+        exports = {}
+        st.caption("Click **Prepare Exports** to build the files for the current report.")
+    
+    for fmt, result in exports.items():
+        if isinstance(result, Exception):
+            st.error(f"{fmt.upper()} export error: {result}")
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        if st.button("📄 Export to DOCX", type="primary"):
-            try:
-                from docx import Document
-                from docx.shared import Inches, Pt
-                import io
-                
-                doc = Document()
-                doc.add_heading('Home Warranty CMS Evaluation Report', 0)
-                doc.add_paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                
-                doc.add_heading('Executive Summary', level=1)
-                doc.add_paragraph('The company is evaluating headless and composable CMS solutions to consolidate 5 legacy platforms into 3 unified platforms.')
-                
-                doc.add_heading('Current State', level=1)
-                doc.add_paragraph('• Primary CMS: HubSpot (underperforming)')
-                doc.add_paragraph('• Legacy Systems: Liferay, Ion, Starmark, Surefire')
-                doc.add_paragraph('• Traffic: ~20K paid views/day')
-                
-                doc.add_heading('Selected Use Cases', level=1)
-                for uc in selected_use_cases:
-                    doc.add_paragraph(f"• {CMS_ONTOLOGY['use_cases'][uc]['label']}", style='List Bullet')
-                
-                doc.add_heading('Recommendation', level=1)
-                doc.add_paragraph('Pursue a phased migration using the Strangler Fig pattern.')
-                
-                buffer = io.BytesIO()
-                doc.save(buffer)
-                buffer.seek(0)
-                
-                st.download_button(
-                    label="⬇️ Download DOCX",
-                    data=buffer,
-                    file_name="cms_evaluation_report.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                )
-            except ImportError:
-                st.error("python-docx not installed")
+        docx_file = exports.get("docx")
+        st.download_button(
+            label="📄 Export to DOCX",
+            data=docx_file if isinstance(docx_file, io.BytesIO) else b"",
+            file_name="cms_evaluation_report.docx",
+            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            type="primary",
+            disabled=not isinstance(docx_file, io.BytesIO),
+            help=None if DOCX_AVAILABLE else "python-docx not installed"
+        )
     
     with col2:
-        if st.button("📊 Export to PPTX", type="primary"):
-            if not stack_recs:
-                st.warning("⚠️ Run AI Stack Recommendations first to generate meaningful content")
-            else:
-                try:
-                    from pptx import Presentation
-                    from pptx.util import Inches, Pt
-                    import io
-                    
-                    prs = Presentation()
-                    
-                    # Slide 1: Title
-                    slide = prs.slides.add_slide(prs.slide_layouts[0])
-                    slide.shapes.title.text = "CMS Evaluation Report"
-                    slide.placeholders[1].text = f"Home Warranty Company | {datetime.now().strftime('%B %Y')}"
-                    
-                    # Slide 2: Business Context (from user input)
-                    slide = prs.slides.add_slide(prs.slide_layouts[1])
-                    slide.shapes.title.text = "Business Context"
-                    tf = slide.placeholders[1].text_frame
-                    context_lines = custom_context.split('\n')[:6]  # First 6 lines
-                    tf.text = context_lines[0] if context_lines else "CMS evaluation in progress"
-                    for line in context_lines[1:]:
-                        if line.strip():
-                            p = tf.add_paragraph()
-                            p.text = line.strip()
-                    
-                    # Slide 3: Selected Use Cases
-                    slide = prs.slides.add_slide(prs.slide_layouts[1])
-                    slide.shapes.title.text = "Priority Use Cases"
-                    tf = slide.placeholders[1].text_frame
-                    tf.text = use_case_labels[0] if use_case_labels else "No use cases selected"
-                    for uc in use_case_labels[1:]:
-                        p = tf.add_paragraph()
-                        p.text = f"• {uc}"
-                    
-                    # Slide 4: Top Recommendation
-                    slide = prs.slides.add_slide(prs.slide_layouts[1])
-                    slide.shapes.title.text = "🏆 Top Recommendation"
-                    tf = slide.placeholders[1].text_frame
-                    tf.text = stack_recs.get('top_recommendation', 'Run AI analysis for recommendations')
-                    if 'migration_strategy' in stack_recs:
-                        p = tf.add_paragraph()
-                        p.text = ""
-                        p = tf.add_paragraph()
-                        p.text = f"Migration Strategy: {stack_recs['migration_strategy']}"
-                    
-                    # Slides for each stack option
-                    for i, stack in enumerate(stack_recs.get('recommended_stacks', [])[:3]):
-                        slide = prs.slides.add_slide(prs.slide_layouts[1])
-                        slide.shapes.title.text = f"Option {chr(65+i)}: {stack.get('name', 'Stack')}"
-                        tf = slide.placeholders[1].text_frame
-                        
-                        tf.text = f"Fit Score: {stack.get('fit_score', 0):.2f} | Cost: {stack.get('cost_tier', '$$')} | Timeline: {stack.get('timeline_months', '?')} months"
-                        
-                        p = tf.add_paragraph()
-                        p.text = f"Components: {', '.join(stack.get('components', []))}"
-                        
-                        p = tf.add_paragraph()
-                        p.text = ""
-                        p = tf.add_paragraph()
-                        p.text = "✅ Pros:"
-                        for pro in stack.get('pros', [])[:3]:
-                            p = tf.add_paragraph()
-                            p.text = f"   • {pro}"
-                        
-                        p = tf.add_paragraph()
-                        p.text = "❌ Cons:"
-                        for con in stack.get('cons', [])[:2]:
-                            p = tf.add_paragraph()
-                            p.text = f"   • {con}"
-                    
-                    # Final slide: Next Steps
-                    slide = prs.slides.add_slide(prs.slide_layouts[1])
-                    slide.shapes.title.text = "Next Steps"
-                    tf = slide.placeholders[1].text_frame
-                    tf.text = "1. Schedule vendor demos for top recommended platforms"
-                    p = tf.add_paragraph()
-                    p.text = "2. Run proof-of-concept on 2-3 high-traffic pages"
-                    p = tf.add_paragraph()
-                    p.text = "3. Calculate detailed TCO for final 2 options"
-                    p = tf.add_paragraph()
-                    p.text = "4. Build migration roadmap with IT team"
-                    
-                    buffer = io.BytesIO()
-                    prs.save(buffer)
-                    buffer.seek(0)
-                    
-                    st.download_button(
-                        label="⬇️ Download PPTX",
-                        data=buffer,
-                        file_name="cms_evaluation_report.pptx",
-                        mime="application/vnd.openxmlformats-officedocument.presentationml.presentation"
-                    )
-                except Exception as e:
-                    st.error(f"PPTX export error: {str(e)}")
+        pptx_file = exports.get("pptx")
+        st.download_button(
+            label="📊 Export to PPTX",
+            data=pptx_file if isinstance(pptx_file, io.BytesIO) else b"",
+            file_name="cms_evaluation_report.pptx",
+            mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+            type="primary",
+            disabled=not isinstance(pptx_file, io.BytesIO),
+            help=("python-pptx not installed" if not PPTX_AVAILABLE
+                  else None if stack_recs else "Run AI Stack Recommendations first to generate meaningful content")
+        )
     
     with col3:
-        if st.button("📑 Export to PDF", type="primary"):
-            try:
-                from reportlab.lib.pagesizes import letter
-                from reportlab.pdfgen import canvas
-                from reportlab.lib.units import inch
-                import io
-                
-                buffer = io.BytesIO()
-                c = canvas.Canvas(buffer, pagesize=letter)
-                width, height = letter
-                
-                # Title
-                c.setFont("Helvetica-Bold", 20)
-                c.drawString(1*inch, height - 1*inch, "Home Warranty CMS Evaluation Report")
-                
-                c.setFont("Helvetica", 12)
-                c.drawString(1*inch, height - 1.5*inch, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                
-                # Executive Summary
-                c.setFont("Helvetica-Bold", 14)
-                c.drawString(1*inch, height - 2.5*inch, "Executive Summary")
-                c.setFont("Helvetica", 11)
-                c.drawString(1*inch, height - 3*inch, "Consolidating 5 CMS platforms to 3 unified platforms.")
-                c.drawString(1*inch, height - 3.3*inch, "Primary goal: Improve conversion rates by 10%+")
-                c.drawString(1*inch, height - 3.6*inch, "Traffic: ~20,000 paid views/day")
-                
-                # Key Findings
-                c.setFont("Helvetica-Bold", 14)
-                c.drawString(1*inch, height - 4.5*inch, "Key Findings")
-                c.setFont("Helvetica", 11)
-                c.drawString(1*inch, height - 5*inch, "• Best overall: Composable CMS + HubSpot CRM")
-                c.drawString(1*inch, height - 5.3*inch, "• Best headless: Contentful")
-                c.drawString(1*inch, height - 5.6*inch, "• Best quick wins: HubSpot + Headless hybrid")
-                
-                # Recommendation
-                c.setFont("Helvetica-Bold", 14)
-                c.drawString(1*inch, height - 6.5*inch, "Recommendation")
-                c.setFont("Helvetica", 11)
-                c.drawString(1*inch, height - 7*inch, "Pursue phased migration using Strangler Fig pattern")
-                
-                c.save()
-                buffer.seek(0)
-                
-                st.download_button(
-                    label="⬇️ Download PDF",
-                    data=buffer,
-                    file_name="cms_evaluation_report.pdf",
-                    mime="application/pdf"
-                )
-            except ImportError:
-                st.error("reportlab not installed")
+        pdf_file = exports.get("pdf")
+        st.download_button(
+            label="📑 Export to PDF",
+            data=pdf_file if isinstance(pdf_file, io.BytesIO) else b"",
+            file_name="cms_evaluation_report.pdf",
+            mime="application/pdf",
+            type="primary",
+            disabled=not isinstance(pdf_file, io.BytesIO),
+            help=None if PDF_AVAILABLE else "reportlab not installed"
+        )
+
+with tab5:
+    render_report_tab(selected_use_cases)
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Footer
@@ -1,14 +1,207 @@
 """
 CMS Data Agents - Fetch real vendor data using Playwright + LLM extraction
 No LangChain - pure Python with our llm_providers abstraction
+Token-accurate truncation with tiktoken when available, ~4 chars/token otherwise
 """
 
 import asyncio
+import atexit
+import hashlib
 import json
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+import re
+import threading
+import time
+from datetime import date
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+
+import orjson
 from llm_providers import get_provider, LLMProvider
 
+# Full scraped text lives on disk; VendorData only carries a short preview
+RAW_CONTENT_DIR = Path(".cache") / "vendor"
+RAW_PREVIEW_CHARS = 1000
+VENDOR_CACHE_TTL = 86400  # seconds before a saved VendorData is considered stale
+
+# Scraped page text, one file per URL, reused until PAGE_CACHE_TTL expires
+# (or longer, while a HEAD request shows the same ETag)
+PAGE_CACHE_DIR = Path(".cache") / "pages"
+PAGE_CACHE_TTL = 86400
+
+
+def save_raw_content(platform: str, raw_content: str) -> Path:
+    """Write the full scraped text for a vendor to the on-disk cache (one file per vendor per day)."""
+    RAW_CONTENT_DIR.mkdir(parents=True, exist_ok=True)
+    path = RAW_CONTENT_DIR / f"{platform.lower()}-{date.today().isoformat()}.txt"
+    path.write_bytes(raw_content.encode("utf-8"))
+    return path
+
+
+def _page_cache_path(url: str) -> Path:
+    """Cache file for url, named by its hash so any URL is a safe filename."""
+    return PAGE_CACHE_DIR / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+
+def load_cached_page(url: str) -> Optional[Dict]:
+    """Cached entry for url ({"content", "etag", "expires"}), or None."""
+    path = _page_cache_path(url)
+    if not path.is_file():
+        return None
+    return orjson.loads(path.read_bytes())
+
+
+def save_cached_page(url: str, content: str, etag: Optional[str]) -> None:
+    """Store scraped page text for url, fresh for PAGE_CACHE_TTL seconds."""
+    PAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    entry = {"content": content, "etag": etag, "expires": time.time() + PAGE_CACHE_TTL}
+    _page_cache_path(url).write_bytes(orjson.dumps(entry))
+
+
+def _validator(headers) -> Optional[str]:
+    """ETag (or Last-Modified) from response headers; None if neither is set."""
+    return headers.get("etag") or headers.get("last-modified")
+
+
+def _head_etag(url: str) -> Optional[str]:
+    """ETag (or Last-Modified) the server reports for url; None if unavailable."""
+    try:
+        import requests
+        return _validator(requests.head(url, allow_redirects=True, timeout=10).headers)
+    except Exception:
+        return None
+
+
+# Most vendor pages are server-rendered; only fall back to Chromium when the
+# raw HTML yields less text than this (i.e. the page is built client-side)
+STATIC_MIN_CHARS = 500
+SCRAPE_MAX_CHARS = 15000  # Limit for LLM context
+EXTRACTION_MAX_TOKENS = 3000  # Docs budget inside the extraction prompt
+
+
+DEDUPE_MIN_CHARS = 200  # shorter blocks (table cells, "Yes"/"No", prices) are never dropped
+
+
+def dedupe_blocks(text: str, min_chars: int = DEDUPE_MIN_CHARS) -> str:
+    """
+    Drop repeated paragraphs, keeping the first occurrence.
+    
+    A vendor's pages share nav/footer/pitch boilerplate, which would
+    otherwise be paid for once per page in the extraction prompt. Blocks are
+    separated by blank lines; only those of at least min_chars are compared,
+    so short repeated values stay where they are.
+    """
+    seen = set()
+    kept = []
+    for block in re.split(r"\n\s*\n", text):
+        stripped = block.strip()
+        if len(stripped) >= min_chars:
+            key = hashlib.sha256(stripped.encode()).digest()[:16]
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(block)
+    return "\n\n".join(kept)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """
+    tiktoken's cl100k_base encoding, loaded on first use.
+    
+    Loading may download the BPE file, so it stays out of import time; any
+    failure (not installed, offline) means None and the chars estimate.
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def truncate_tokens(text: str, max_tokens: int = EXTRACTION_MAX_TOKENS) -> str:
+    """Cut text to at most max_tokens tokens (estimated when tiktoken is missing)."""
+    encoding = _encoding()
+    if encoding is None:
+        return text[:max_tokens * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+class _TextExtractor(HTMLParser):
+    """
+    Collect visible text roughly as innerText lays it out, skipping the same
+    elements scrape_page() strips in the browser.
+    
+    Inline markup stays on its line, block elements start a new one (p and
+    headings leave a blank line), and the cells of a table row are joined by tabs.
+    """
+    
+    SKIP_TAGS = frozenset({"head", "script", "style", "nav", "header", "footer", "aside", "iframe"})
+    BLOCK_TAGS = frozenset({
+        "address", "article", "blockquote", "br", "dd", "details", "div", "dl", "dt",
+        "fieldset", "figcaption", "figure", "form", "hr", "li", "main", "ol", "pre",
+        "section", "summary", "table", "tbody", "tfoot", "thead", "tr", "ul"
+    })
+    PARAGRAPH_TAGS = frozenset({"p", "h1", "h2", "h3", "h4", "h5", "h6"})
+    CELL_TAGS = frozenset({"td", "th"})
+    
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self._line = []
+        self._skip_depth = 0
+    
+    def _break(self, blank: bool = False):
+        """End the current line; with blank, also leave an empty line after it."""
+        line = re.sub(r" *\t *", "\t", "".join(self._line)).strip()
+        self._line = []
+        if line:
+            self.lines.append(line)
+        if blank and self.lines and self.lines[-1]:
+            self.lines.append("")
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.CELL_TAGS:
+            if "".join(self._line).strip():
+                self._line.append("\t")
+        elif tag in self.BLOCK_TAGS or tag in self.PARAGRAPH_TAGS:
+            self._break(blank=tag in self.PARAGRAPH_TAGS)
+    
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+        elif tag in self.BLOCK_TAGS or tag in self.PARAGRAPH_TAGS:
+            self._break(blank=tag in self.PARAGRAPH_TAGS)
+    
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._line.append(re.sub(r"\s+", " ", data))
+    
+    def text(self) -> str:
+        """The collected text; call after close()."""
+        self._break()
+        return "\n".join(self.lines).strip()
+
+
+def fetch_static_text(url: str) -> Tuple[str, Optional[str]]:
+    """Fetch url without a browser; return its visible text (no JS is run) and ETag."""
+    import requests
+    response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=15)
+    response.raise_for_status()
+    
+    parser = _TextExtractor()
+    parser.feed(response.text)
+    parser.close()
+    return parser.text()[:SCRAPE_MAX_CHARS], _validator(response.headers)
+
 
 @dataclass
 class VendorData:
@@ -21,6 +214,27 @@ class VendorData:
     raw_content: str
 
 
+def save_vendor_data(data: VendorData) -> Path:
+    """Persist a VendorData as JSON so it survives app restarts."""
+    RAW_CONTENT_DIR.mkdir(parents=True, exist_ok=True)
+    path = RAW_CONTENT_DIR / f"{data.platform.lower()}.json"
+    path.write_bytes(orjson.dumps(asdict(data)))
+    return path
+
+
+def load_cached_vendor_data(max_age: float = VENDOR_CACHE_TTL) -> Dict[str, VendorData]:
+    """Load every saved VendorData younger than max_age seconds, keyed by vendor."""
+    if not RAW_CONTENT_DIR.is_dir():
+        return {}
+    
+    now = time.time()
+    cached = {}
+    for path in RAW_CONTENT_DIR.glob("*.json"):
+        if now - path.stat().st_mtime < max_age:
+            cached[path.stem] = VendorData(**orjson.loads(path.read_bytes()))
+    return cached
+
+
 class CMSDataAgent:
     """
     Lightweight agent that scrapes vendor sites and extracts structured data.
@@ -49,37 +263,114 @@ class CMSDataAgent:
         ],
     }
     
-    def __init__(self, provider: Optional[LLMProvider] = None):
+    # Never reflected in body.innerText. Stylesheets stay: innerText depends on
+    # CSS, and without it hidden menus, modals and banners turn into page text.
+    BLOCKED_RESOURCES = frozenset({"image", "media", "font"})
+    
+    def __init__(self, provider: Optional[LLMProvider] = None, max_concurrent_scrapes: int = 3):
         self.llm = provider or get_provider("ollama")
+        self.max_concurrent_scrapes = max_concurrent_scrapes
         self._browser = None
         self._playwright = None
+        self._context = None
+        self._page_pool = None
+        self._browser_lock = None
+        self._extractions = {}  # sha256(platform + raw_content) -> extracted dict
     
     async def _get_browser(self):
-        """Lazy init Playwright browser"""
-        if self._browser is None:
-            from playwright.async_api import async_playwright
-            self._playwright = await async_playwright().start()
-            self._browser = await self._playwright.chromium.launch(headless=True)
+        """
+        Lazy init Playwright browser (once, even with concurrent callers).
+        
+        Also creates the shared BrowserContext and a pool of
+        max_concurrent_scrapes pages that scrape_page() reuses.
+        """
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+        async with self._browser_lock:
+            if self._browser is None:
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                self._context = await self._browser.new_context(
+                    viewport={"width": 1280, "height": 800}
+                )
+                await self._context.route("**/*", self._block_assets)
+                self._page_pool = asyncio.Queue()
+                for _ in range(self.max_concurrent_scrapes):
+                    self._page_pool.put_nowait(await self._context.new_page())
         return self._browser
     
+    async def _block_assets(self, route):
+        """Abort requests for assets that don't affect the page text"""
+        if route.request.resource_type in self.BLOCKED_RESOURCES:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def start(self) -> "CMSDataAgent":
+        """Launch the browser up front so the first scrape doesn't pay for it"""
+        await self._get_browser()
+        return self
+    
     async def close(self):
-        """Cleanup browser resources"""
+        """Cleanup browser resources (the next scrape relaunches them)"""
+        if self._context:
+            await self._context.close()
         if self._browser:
             await self._browser.close()
         if self._playwright:
             await self._playwright.stop()
+        self._context = self._browser = self._playwright = self._page_pool = None
     
-    async def scrape_page(self, url: str, wait_for: str = "body") -> str:
+    async def scrape_page(self, url: str) -> str:
         """
-        Scrape a single page using Playwright.
-        Handles JS-rendered content.
+        Scrape a single page.
+        Tries a plain HTTP fetch first and falls back to Playwright for
+        JS-rendered content.
+        
+        Browser pages come from a shared pool, so at most max_concurrent_scrapes
+        are loading at once and no page is created or torn down per URL.
+        
+        Results are cached on disk per URL (see PAGE_CACHE_DIR). An expired
+        entry is reused, without opening a page, if its ETag hasn't changed.
+        """
+        cached = load_cached_page(url)
+        if cached:
+            if cached["expires"] > time.time():
+                return cached["content"]
+            etag = await asyncio.to_thread(_head_etag, url)
+            if etag and cached["etag"] == etag:
+                save_cached_page(url, cached["content"], etag)
+                return cached["content"]
+        
+        content, etag = await self._fetch_page(url)
+        if not content.startswith(f"Error scraping {url}"):
+            save_cached_page(url, content, etag)
+        return content
+    
+    async def _fetch_page(self, url: str) -> Tuple[str, Optional[str]]:
         """
-        browser = await self._get_browser()
-        page = await browser.new_page()
+        Plain HTTP fetch first; render in Chromium only if that finds too little text.
         
+        Returns the page text and the ETag of the response it came from.
+        """
         try:
-            await page.goto(url, timeout=30000)
-            await page.wait_for_selector(wait_for, timeout=10000)
+            content, etag = await asyncio.to_thread(fetch_static_text, url)
+            if len(content) >= STATIC_MIN_CHARS:
+                return content, etag
+        except Exception:
+            pass
+        return await self._render_page(url)
+    
+    async def _render_page(self, url: str) -> Tuple[str, Optional[str]]:
+        """Load url in a pooled page and return its visible text and ETag"""
+        await self._get_browser()
+        page = await self._page_pool.get()
+        
+        try:
+            # The DOM is all we read; don't wait for trackers and images to fire "load"
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            etag = _validator(response.headers) if response else None
             
             # Remove non-content elements
             await page.evaluate("""
@@ -87,65 +378,78 @@ class CMSDataAgent:
                     .forEach(el => el.remove());
             """)
             
-            # Get clean text content
-            content = await page.evaluate("document.body.innerText")
-            return content[:15000]  # Limit for LLM context
+            # Get clean text content, sliced in the page so only the kept part crosses CDP
+            text = await page.evaluate(
+                "(n) => document.body.innerText.slice(0, n)", SCRAPE_MAX_CHARS
+            )
+            return text, etag
             
         except Exception as e:
-            return f"Error scraping {url}: {e}"
+            return f"Error scraping {url}: {e}", None
         finally:
-            await page.close()
+            page = await self._reset_page(page)
+            self._page_pool.put_nowait(page)
+    
+    async def _reset_page(self, page):
+        """Blank a page for reuse, replacing it if it has crashed or closed"""
+        try:
+            await page.goto("about:blank")
+            return page
+        except Exception:
+            return await self._context.new_page()
     
     async def scrape_vendor(self, platform: str) -> str:
-        """Scrape all known docs for a vendor"""
+        """
+        Scrape all known docs for a vendor.
+        
+        The vendor's URLs are loaded concurrently, within the page pool's limit.
+        """
         urls = self.VENDOR_DOCS.get(platform.lower(), [])
         if not urls:
             return f"No known documentation URLs for {platform}"
         
-        all_content = []
-        for url in urls:
-            content = await self.scrape_page(url)
-            all_content.append(f"=== Source: {url} ===\n{content}")
+        contents = await asyncio.gather(*(self.scrape_page(url) for url in urls))
         
-        return "\n\n".join(all_content)
+        return "\n\n".join(
+            f"=== Source: {url} ===\n{content}" for url, content in zip(urls, contents)
+        )
     
-    def extract_capabilities(self, platform: str, raw_content: str) -> Dict:
-        """
-        Use LLM to extract structured capabilities from raw docs.
-        """
-        schema = {
-            "type": "object",
-            "properties": {
-                "capabilities": {
-                    "type": "object",
-                    "properties": {
-                        "content_modeling": {"type": "integer"},
-                        "delivery": {"type": "integer"},
-                        "personalization": {"type": "integer"},
-                        "workflow": {"type": "integer"},
-                        "integrations": {"type": "integer"},
-                        "performance": {"type": "integer"},
-                        "operational": {"type": "integer"}
-                    }
-                },
-                "pricing_tier": {"type": "string"},
-                "key_features": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                },
-                "strengths": {
-                    "type": "array", 
-                    "items": {"type": "string"}
-                },
-                "weaknesses": {
-                    "type": "array",
-                    "items": {"type": "string"}
+    # Structured output schema for capability extraction
+    EXTRACTION_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "capabilities": {
+                "type": "object",
+                "properties": {
+                    "content_modeling": {"type": "integer"},
+                    "delivery": {"type": "integer"},
+                    "personalization": {"type": "integer"},
+                    "workflow": {"type": "integer"},
+                    "integrations": {"type": "integer"},
+                    "performance": {"type": "integer"},
+                    "operational": {"type": "integer"}
                 }
             },
-            "required": ["capabilities", "key_features"]
-        }
-        
-        prompt = f"""
+            "pricing_tier": {"type": "string"},
+            "key_features": {
+                "type": "array",
+                "items": {"type": "string"}
+            },
+            "strengths": {
+                "type": "array", 
+                "items": {"type": "string"}
+            },
+            "weaknesses": {
+                "type": "array",
+                "items": {"type": "string"}
+            }
+        },
+        "required": ["capabilities", "key_features"]
+    }
+    
+    def build_extraction_prompt(self, platform: str, raw_content: str) -> str:
+        """Prompt asking the LLM to score capabilities from raw docs."""
+        return f"""
 Analyze this CMS vendor documentation for {platform}.
 
 Score each capability from 0-3:
@@ -164,13 +468,37 @@ Capabilities to score:
 - operational: Vendor stability, docs quality, support
 
 DOCUMENTATION:
-{raw_content[:12000]}
+{truncate_tokens(dedupe_blocks(raw_content))}
 
 Extract structured data as JSON.
 """
-        
-        response = self.llm.chat(prompt, schema)
-        return response.content
+    
+    @staticmethod
+    def _extraction_key(platform: str, raw_content: str) -> str:
+        """Memo key for extract_capabilities()"""
+        return hashlib.sha256(f"{platform}\0{raw_content}".encode()).hexdigest()
+    
+    def extract_capabilities(self, platform: str, raw_content: str) -> Dict:
+        """
+        Use LLM to extract structured capabilities from raw docs.
+        Identical (platform, raw_content) inputs reuse the earlier result.
+        """
+        key = self._extraction_key(platform, raw_content)
+        if key not in self._extractions:
+            prompt = self.build_extraction_prompt(platform, raw_content)
+            self._extractions[key] = self.llm.chat(prompt, self.EXTRACTION_SCHEMA).content
+        return self._extractions[key]
+    
+    async def aextract_capabilities(self, platform: str, raw_content: str) -> Dict:
+        """
+        Async extract_capabilities(), so several vendors can be extracted concurrently.
+        """
+        key = self._extraction_key(platform, raw_content)
+        if key not in self._extractions:
+            prompt = self.build_extraction_prompt(platform, raw_content)
+            response = await self.llm.achat(prompt, self.EXTRACTION_SCHEMA)
+            self._extractions[key] = response.content
+        return self._extractions[key]
     
     async def fetch_platform_data(self, platform: str) -> VendorData:
         """
@@ -179,38 +507,74 @@ Extract structured data as JSON.
         # 1. Scrape vendor docs
         raw_content = await self.scrape_vendor(platform)
         
-        # 2. Extract structured data via LLM
-        extracted = self.extract_capabilities(platform, raw_content)
+        # 2. Extract structured data via LLM (async, so other vendors keep going)
+        extracted = await self.aextract_capabilities(platform, raw_content)
         
-        # 3. Package into VendorData
+        # 3. Keep the full text on disk, package a preview into VendorData
+        save_raw_content(platform, raw_content)
         return VendorData(
             platform=platform,
             capabilities=extracted.get("capabilities", {}),
             pricing_info=extracted.get("pricing_tier", "Unknown"),
             features=extracted.get("key_features", []),
             source_urls=self.VENDOR_DOCS.get(platform.lower(), []),
-            raw_content=raw_content[:5000]
+            raw_content=raw_content[:RAW_PREVIEW_CHARS]
         )
     
     async def fetch_all_platforms(self, platforms: List[str]) -> Dict[str, VendorData]:
         """Fetch data for multiple platforms concurrently"""
+        fetched = await asyncio.gather(
+            *(self.fetch_platform_data(platform) for platform in platforms),
+            return_exceptions=True
+        )
+        
         results = {}
-        for platform in platforms:
-            try:
-                data = await self.fetch_platform_data(platform)
+        for platform, data in zip(platforms, fetched):
+            if isinstance(data, Exception):
+                print(f"Error fetching {platform}: {data}")
+            else:
                 results[platform] = data
-            except Exception as e:
-                print(f"Error fetching {platform}: {e}")
         
         await self.close()
         return results
 
 
+# Sync callers share one event loop on a daemon thread (and one agent on it),
+# so the browser is launched once per process rather than once per call
+_loop = None
+_loop_lock = threading.Lock()
+_default_agent = None
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """Process-wide event loop running forever on a daemon thread; submit with run_coroutine_threadsafe()."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="cms-data-agent", daemon=True).start()
+    return _loop
+
+
+def run_sync(coro):
+    """Run a coroutine on background_loop() and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, background_loop()).result()
+
+
+def _get_default_agent() -> CMSDataAgent:
+    """Agent used by the sync helpers; its browser is closed at exit."""
+    global _default_agent
+    with _loop_lock:
+        if _default_agent is None:
+            _default_agent = CMSDataAgent()
+            atexit.register(lambda: run_sync(_default_agent.close()))
+    return _default_agent
+
+
 # Convenience function for sync usage
 def fetch_vendor_data(platform: str) -> VendorData:
     """Sync wrapper for fetching vendor data"""
-    agent = CMSDataAgent()
-    return asyncio.run(agent.fetch_platform_data(platform))
+    return run_sync(_get_default_agent().fetch_platform_data(platform))
 
 
 # CLI for testing
@@ -3,9 +3,13 @@ CINCH CMS Evaluation Framework – Core Libraries
 Reusable Python classes for evaluation, scoring, and reporting
 """
 
-import json
+import io
+import sys
+from functools import cached_property, lru_cache
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
+import numpy as np
+import orjson
 from pydantic import BaseModel
 
 
@@ -13,7 +17,7 @@ from pydantic import BaseModel
 # ONTOLOGY MODULE
 # ============================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Capability:
     """Represents a CMS capability dimension."""
     key: str
@@ -23,7 +27,7 @@ class Capability:
     importance: str  # "critical", "high", "medium"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UseCase:
     """Represents a business use case."""
     key: str
@@ -31,7 +35,7 @@ class UseCase:
     required_capabilities: Dict[str, int]  # capability_key -> min_level
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BusinessOutcome:
     """Represents a business outcome/KPI."""
     key: str
@@ -40,42 +44,59 @@ class BusinessOutcome:
 
 
 class CMSOntology:
-    """Encapsulates the CMS evaluation ontology."""
+    """
+    Encapsulates the CMS evaluation ontology.
+    
+    The Capability/UseCase/BusinessOutcome objects are built on first
+    access to each section, so callers that only need keys don't pay for them.
+    """
     
     def __init__(self, ontology_dict: Dict[str, Any]):
         self.raw = ontology_dict
-        self.capabilities = {
-            k: Capability(
-                key=k,
+        self._raw_caps = ontology_dict.get("capabilities", {})
+        self._raw_use_cases = ontology_dict.get("use_cases", {})
+        self._raw_outcomes = ontology_dict.get("business_outcomes", {})
+    
+    @cached_property
+    def capabilities(self) -> Dict[str, Capability]:
+        return {
+            sys.intern(k): Capability(
+                key=sys.intern(k),
                 label=v["label"],
                 facets=v["facets"],
                 scale=v["scale"],
                 importance=v["importance"]
             )
-            for k, v in ontology_dict.get("capabilities", {}).items()
+            for k, v in self._raw_caps.items()
         }
-        self.use_cases = {
-            k: UseCase(
-                key=k,
+    
+    @cached_property
+    def use_cases(self) -> Dict[str, UseCase]:
+        return {
+            sys.intern(k): UseCase(
+                key=sys.intern(k),
                 label=v["label"],
-                required_capabilities=v["required_capabilities"]
+                required_capabilities={sys.intern(c): lvl for c, lvl in v["required_capabilities"].items()}
             )
-            for k, v in ontology_dict.get("use_cases", {}).items()
+            for k, v in self._raw_use_cases.items()
         }
-        self.business_outcomes = {
-            k: BusinessOutcome(
-                key=k,
+    
+    @cached_property
+    def business_outcomes(self) -> Dict[str, BusinessOutcome]:
+        return {
+            sys.intern(k): BusinessOutcome(
+                key=sys.intern(k),
                 label=v["label"],
                 weight=v["weight"]
             )
-            for k, v in ontology_dict.get("business_outcomes", {}).items()
+            for k, v in self._raw_outcomes.items()
         }
     
     @classmethod
     def from_file(cls, filepath: str) -> "CMSOntology":
         """Load ontology from JSON file."""
-        with open(filepath, "r") as f:
-            data = json.load(f)
+        with open(filepath, "rb") as f:
+            data = orjson.loads(f.read())
         return cls(data)
     
     def get_capability(self, key: str) -> Optional[Capability]:
@@ -85,10 +106,10 @@ class CMSOntology:
         return self.use_cases.get(key)
     
     def capability_keys(self) -> List[str]:
-        return list(self.capabilities.keys())
+        return list(self._raw_caps.keys())
     
     def use_case_keys(self) -> List[str]:
-        return list(self.use_cases.keys())
+        return list(self._raw_use_cases.keys())
 
 
 # ============================================================================
@@ -110,6 +131,68 @@ class PlatformAssessment(BaseModel):
         return self.model_dump()
 
 
+# Simplified schema for Ollama compatibility; static, so built once at import
+ASSESSMENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "platform": {"type": "string"},
+        "capability_scores": {
+            "type": "object"
+        },
+        "strengths": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "weaknesses": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "best_for_use_case": {"type": "string"},
+        "overall_fit_score": {"type": "number"}
+    },
+    "required": [
+        "platform",
+        "capability_scores",
+        "strengths",
+        "weaknesses",
+        "best_for_use_case",
+        "overall_fit_score"
+    ]
+}
+
+
+@lru_cache(maxsize=8)
+def _build_prompt_prefix(capability_labels: tuple) -> str:
+    """
+    Static part of the evaluation prompt for one ontology's capabilities.
+    
+    Kept identical across platforms (and first in the prompt) so it is built
+    once and provider-side prompt caching can match it byte for byte.
+    """
+    capability_names = ", ".join(f"{label} (scale 0-3)" for label in capability_labels)
+    return f"""
+You are a CMS evaluation expert.
+
+Evaluate across these capabilities (scale 0-3, where 3 is excellent):
+{capability_names}
+
+CINCH REQUIREMENTS:
+- 20K+ paid views/day, 6K-7K unique visitors
+- Primary goal: improve conversion rates and drive enrollments
+- Currently spread across 5 CMS (HubSpot, Liferay, Ion, Starmark, Surefire)
+- Want to consolidate but accept 3-platform reality
+- Avoid Sitecore-scale monolith, avoid lightweight tools
+- Interested in headless/composable approach
+
+Provide your assessment as JSON with:
+1. capability_scores: Dict of capability_key -> score (0-3)
+2. strengths: 3 key strengths for CINCH
+3. weaknesses: 3 key weaknesses for CINCH
+4. best_for_use_case: Which use case this platform fits best
+5. overall_fit_score: 0.0-1.0 overall fit score
+"""
+
+
 class PlatformEvaluator:
     """Evaluates platforms using LLM with structured outputs."""
     
@@ -144,68 +227,19 @@ class PlatformEvaluator:
             PlatformAssessment with capability scores and analysis
         """
         
-        # Build prompt
-        capability_names = ", ".join([
-            f"{cap.label} (scale 0-3)"
-            for cap in ontology.capabilities.values()
-        ])
-        
-        prompt = f"""
-You are a CMS evaluation expert. Assess the '{platform_name}' CMS platform.
-
-Evaluate across these capabilities (scale 0-3, where 3 is excellent):
-{capability_names}
+        # Build prompt: shared prefix, then only the platform-specific tail
+        prefix = _build_prompt_prefix(
+            tuple(cap.label for cap in ontology.capabilities.values())
+        )
+        prompt = f"""{prefix}
+Assess the '{platform_name}' CMS platform.
 
 CONTEXT:
 {context or "Use your knowledge of " + platform_name + " from public documentation."}
-
-CINCH REQUIREMENTS:
-- 20K+ paid views/day, 6K-7K unique visitors
-- Primary goal: improve conversion rates and drive enrollments
-- Currently spread across 5 CMS (HubSpot, Liferay, Ion, Starmark, Surefire)
-- Want to consolidate but accept 3-platform reality
-- Avoid Sitecore-scale monolith, avoid lightweight tools
-- Interested in headless/composable approach
-
-Provide your assessment as JSON with:
-1. capability_scores: Dict of capability_key -> score (0-3)
-2. strengths: 3 key strengths for CINCH
-3. weaknesses: 3 key weaknesses for CINCH
-4. best_for_use_case: Which use case this platform fits best
-5. overall_fit_score: 0.0-1.0 overall fit score
 """
         
-        # Simplified schema for Ollama compatibility
-        assessment_schema = {
-            "type": "object",
-            "properties": {
-                "platform": {"type": "string"},
-                "capability_scores": {
-                    "type": "object"
-                },
-                "strengths": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                },
-                "weaknesses": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                },
-                "best_for_use_case": {"type": "string"},
-                "overall_fit_score": {"type": "number"}
-            },
-            "required": [
-                "platform",
-                "capability_scores",
-                "strengths",
-                "weaknesses",
-                "best_for_use_case",
-                "overall_fit_score"
-            ]
-        }
-        
         # Call LLM with structured output
-        response = self.provider.chat(prompt, assessment_schema)
+        response = self.provider.chat(prompt, ASSESSMENT_SCHEMA)
         response_json = response.content
         
         return PlatformAssessment(
@@ -286,6 +320,52 @@ class CapabilityScorer:
         
         # Weighted composite
         return (use_case_fit * 0.6) + (business_fit * 0.4)
+    
+    def batch_score(
+        self,
+        assessments: List[PlatformAssessment],
+        use_case_keys: List[str]
+    ) -> np.ndarray:
+        """
+        composite_score() for many assessments at once.
+        
+        Builds a (platforms, capabilities) score matrix and a
+        (use_cases, capabilities) requirement matrix and scores every pair
+        in one broadcast instead of per-platform dict loops.
+        
+        Returns: (len(assessments),) float array of 0.0-1.0 composite scores
+        """
+        use_cases = [self.ontology.get_use_case(k) for k in use_case_keys]
+        # Ontology capabilities plus any a use case requires without defining,
+        # which score_for_use_case() also counts (at the assessment's score or 0)
+        cap_keys = self.ontology.capability_keys()
+        for uc in use_cases:
+            if uc:
+                cap_keys.extend(k for k in uc.required_capabilities if k not in cap_keys)
+        
+        scores = np.array(
+            [[a.capability_scores.get(k, 0) for k in cap_keys] for a in assessments],
+            dtype=np.float32
+        ).reshape(len(assessments), len(cap_keys))
+        required = np.array(
+            [[uc.required_capabilities.get(k, 0) if uc else 0 for k in cap_keys] for uc in use_cases],
+            dtype=np.float32
+        ).reshape(len(use_cases), len(cap_keys))
+        # Same cells score_for_use_case() visits: every listed requirement, even level 0
+        listed = np.array(
+            [[bool(uc) and k in uc.required_capabilities for k in cap_keys] for uc in use_cases],
+            dtype=bool
+        ).reshape(len(use_cases), len(cap_keys))
+        
+        fit = np.minimum(scores[:, None, :] / np.maximum(required, 1)[None, :, :], 1.0)
+        fit_sums = np.where(listed[None, :, :], fit, 0.0).sum(axis=2)
+        counts = listed.sum(axis=1)
+        per_use_case = np.divide(fit_sums, counts, out=np.zeros_like(fit_sums), where=counts > 0)
+        
+        use_case_fit = per_use_case.mean(axis=1) if use_cases else np.zeros(len(assessments))
+        business_fit = np.array([a.overall_fit_score for a in assessments], dtype=np.float32)
+        
+        return (use_case_fit * 0.6) + (business_fit * 0.4)
 
 
 # ============================================================================
@@ -302,49 +382,44 @@ class ReportGenerator:
         title: str = "CMS Evaluation Report"
     ) -> str:
         """Generate markdown report."""
+        out = io.StringIO()
+        w = out.write
         
-        lines = [
-            f"# {title}",
-            f"**Generated:** {datetime.now().isoformat()}",
-            "",
-            "## Executive Summary",
-            "Evaluation of CMS platforms against business and technical requirements.",
-            "",
-            "## Platform Assessments",
-            ""
-        ]
+        w(f"# {title}\n"
+          f"**Generated:** {datetime.now().isoformat()}\n"
+          "\n"
+          "## Executive Summary\n"
+          "Evaluation of CMS platforms against business and technical requirements.\n"
+          "\n"
+          "## Platform Assessments\n"
+          "\n")
         
         for eval in evaluations:
-            lines.extend([
-                f"### {eval.platform}",
-                f"**Overall Fit:** {eval.overall_fit_score:.2f}/1.0",
-                "",
-                "**Strengths:**",
-                *[f"- {s}" for s in eval.strengths],
-                "",
-                "**Weaknesses:**",
-                *[f"- {w}" for w in eval.weaknesses],
-                "",
-                f"**Best for:** {eval.best_for_use_case}",
-                ""
-            ])
+            w(f"### {eval.platform}\n"
+              f"**Overall Fit:** {eval.overall_fit_score:.2f}/1.0\n"
+              "\n"
+              "**Strengths:**\n")
+            w("".join(f"- {strength}\n" for strength in eval.strengths))
+            w("\n"
+              "**Weaknesses:**\n")
+            w("".join(f"- {weakness}\n" for weakness in eval.weaknesses))
+            w(f"\n"
+              f"**Best for:** {eval.best_for_use_case}\n"
+              "\n")
         
-        lines.extend([
-            "## Recommendations",
-            "",
-            *[f"**{r}**" for r in recommendations],
-            ""
-        ])
+        w("## Recommendations\n"
+          "\n")
+        w("".join(f"**{r}**\n" for r in recommendations))
         
-        return "\n".join(lines)
+        return out.getvalue()
     
     def generate_docx(
         self,
         evaluations: List[PlatformAssessment],
         recommendations: List[str],
         title: str = "CMS Evaluation Report"
-    ) -> bytes:
-        """Generate DOCX report (requires python-docx)."""
+    ) -> io.BytesIO:
+        """Generate DOCX report (requires python-docx), returned as a rewound buffer."""
         try:
             from docx import Document
             from docx.shared import Pt, Inches
@@ -375,11 +450,11 @@ class ReportGenerator:
             for r in recommendations:
                 doc.add_paragraph(r, style="List Bullet")
             
-            # Save to bytes
-            import io
+            # Save to an in-memory buffer
             buffer = io.BytesIO()
             doc.save(buffer)
-            return buffer.getvalue()
+            buffer.seek(0)
+            return buffer
         
         except ImportError:
             raise ImportError("python-docx is required for DOCX generation. Install with: pip install python-docx")
@@ -3,14 +3,40 @@ LLM Provider Abstraction for CMS Evaluation Framework
 Supports Ollama (local), OpenAI (cloud), and Anthropic Claude (cloud) providers
 """
 
-import json
+import asyncio
+import copy
+import hashlib
 import os
+import random
+import sqlite3
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional
+from dataclasses import dataclass, asdict, replace
 
+import orjson
 
-@dataclass
+
+def _loads(data):
+    """Parse JSON text or bytes."""
+    return orjson.loads(data)
+
+
+def _dumps(obj, sort_keys: bool = False) -> str:
+    """Serialize to a compact JSON str."""
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+
+
+# SDK-level retries for 429/5xx/timeouts (exponential backoff with jitter)
+_MAX_RETRIES = 5
+# Requests per call when the reply isn't valid JSON
+_JSON_ATTEMPTS = 2
+
+
+@dataclass(slots=True)
 class LLMResponse:
     """Unified response from LLM providers."""
     content: Dict[str, Any]
@@ -19,9 +45,109 @@ class LLMResponse:
     raw_text: str
 
 
+# Serialized schema text, keyed by
+# (id(schema), tag). Schemas are static dicts passed on every call, so this
+# skips re-walking them; each entry holds the dict itself, so its id can't be
+# reused by another object while cached.
+_SCHEMA_TEXT: "OrderedDict[tuple, tuple]" = OrderedDict()
+_SCHEMA_TEXT_MAX = 256
+_SCHEMA_TEXT_LOCK = threading.Lock()
+
+
+def _per_schema(schema: Dict[str, Any], tag: tuple, build) -> str:
+    """build(schema) memoized per schema object and tag."""
+    key = (id(schema),) + tag
+    with _SCHEMA_TEXT_LOCK:
+        entry = _SCHEMA_TEXT.get(key)
+        if entry is not None and entry[0] is schema:
+            _SCHEMA_TEXT.move_to_end(key)
+            return entry[1]
+    
+    text = build(schema)
+    with _SCHEMA_TEXT_LOCK:
+        _SCHEMA_TEXT[key] = (schema, text)
+        if len(_SCHEMA_TEXT) > _SCHEMA_TEXT_MAX:
+            _SCHEMA_TEXT.popitem(last=False)
+    return text
+
+
+def _schema_text(schema: Dict[str, Any], sort_keys: bool = False) -> str:
+    """_dumps(schema, ...) memoized per schema object."""
+    return _per_schema(schema, ("json", sort_keys), lambda s: _dumps(s, sort_keys=sort_keys))
+
+
+def _openai_response_format(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    response_format that constrains OpenAI decoding to the schema.
+    
+    The schema is sent only here, not repeated in the prompt text. Not strict:
+    our schemas leave some objects open (e.g. capability_scores), which
+    strict mode rejects.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": "structured_output", "schema": schema}
+    }
+
+
+# Anthropic has no JSON mode; forcing a call to this tool makes the model
+# emit arguments that match the schema instead of free-form text
+_ANTHROPIC_TOOL_NAME = "structured_output"
+
+
+def _anthropic_tool(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Tool definition whose input schema is the requested output schema.
+    
+    It only changes with the schema and leads the request, so it is marked
+    for prompt caching and served from cache on repeat calls.
+    """
+    return {
+        "name": _ANTHROPIC_TOOL_NAME,
+        "description": "Return the response as structured data.",
+        "input_schema": schema,
+        "cache_control": {"type": "ephemeral"}
+    }
+
+
+# Sync SDK clients are shared by every provider instance with the same settings,
+# so repeated get_provider() calls reuse one keep-alive connection pool
+_CLIENTS: Dict[tuple, Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _shared_client(key: tuple, factory):
+    """Return the client cached under key, building it with factory() on first use."""
+    with _CLIENTS_LOCK:
+        if key not in _CLIENTS:
+            _CLIENTS[key] = factory()
+        return _CLIENTS[key]
+
+
+def _pool_limits():
+    """Connection pool limits for the shared clients."""
+    import httpx
+    return httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=90.0)
+
+
+def _http_client():
+    """httpx client for the cloud SDKs: pooled, with a bounded connect timeout."""
+    import httpx
+    return httpx.Client(limits=_pool_limits(), timeout=httpx.Timeout(120.0, connect=10.0))
+
+
+def _async_http_client():
+    """Async counterpart of _http_client(), one per provider instance (pools are loop-bound)."""
+    import httpx
+    return httpx.AsyncClient(limits=_pool_limits(), timeout=httpx.Timeout(120.0, connect=10.0))
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
     
+    provider: str = ""  # LLMResponse.provider value
+    model: str = ""
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -42,15 +168,67 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def achat(self, prompt: str, schema: Dict[str, Any]) -> LLMResponse:
+        """
+        Async variant of chat() so several requests can be in flight at once.
+        
+        Providers with a native async client override this; the default
+        runs the blocking chat() in a worker thread.
+        """
+        return await asyncio.to_thread(self.chat, prompt, schema)
+    
+    def stream_chat(self, prompt: str, schema: Dict[str, Any]) -> Iterator[str]:
+        """
+        Stream the structured output as text chunks as the model generates them.
+        
+        Join the chunks and parse the JSON once the stream ends.
+        Providers with a streaming API override this; the default yields the
+        whole chat() reply as a single chunk.
+        """
+        yield self.chat(prompt, schema).raw_text
+    
     @abstractmethod
     def is_available(self) -> bool:
         """Check if the provider is available."""
         pass
 
 
+_OLLAMA_LIST_TTL = 30  # seconds a server's model list is reused
+
+
+@lru_cache(maxsize=8)
+def _ollama_model_names(client, time_bucket: int) -> frozenset:
+    """Model names without tags on the server behind client; time_bucket expires entries."""
+    return frozenset(m.get('name', '').split(':', 1)[0] for m in client.list().get('models', []))
+
+
+# Ollama requests retried on connection errors and 5xx replies, with
+# exponential backoff (capped, jittered); the ollama client has no retries
+_OLLAMA_RETRIES = 3
+_OLLAMA_BACKOFF = 0.5
+_OLLAMA_BACKOFF_MAX = 8.0
+
+
+def _ollama_transient(exc: Exception) -> bool:
+    """Whether a failed Ollama request is worth retrying."""
+    import httpx
+    import ollama
+    # The client re-raises httpx.ConnectError as the builtin ConnectionError
+    if isinstance(exc, (httpx.TransportError, ConnectionError)):
+        return True
+    return isinstance(exc, ollama.ResponseError) and exc.status_code >= 500
+
+
+def _ollama_delay(attempt: int) -> float:
+    """Backoff before retry number attempt + 1."""
+    return min(_OLLAMA_BACKOFF_MAX, _OLLAMA_BACKOFF * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
 class OllamaProvider(LLMProvider):
     """Ollama local model provider."""
     
+    provider = "ollama"
+    
     def __init__(
         self, 
         model: str = "llama3.1",
@@ -59,6 +237,7 @@ class OllamaProvider(LLMProvider):
         self.model = model
         self.host = host
         self._client = None
+        self._async_client = None
     
     @property
     def name(self) -> str:
@@ -69,45 +248,138 @@ class OllamaProvider(LLMProvider):
         if self._client is None:
             try:
                 import ollama
-                self._client = ollama.Client(host=self.host)
+                # No request timeout: local generation can legitimately take minutes
+                self._client = _shared_client(
+                    ("ollama", self.host),
+                    lambda: ollama.Client(host=self.host, limits=_pool_limits())
+                )
             except ImportError:
                 raise ImportError(
                     "Ollama library not installed. Run: pip install ollama"
                 )
         return self._client
     
+    def _get_async_client(self):
+        """Lazy initialize Ollama async client."""
+        if self._async_client is None:
+            try:
+                import ollama
+                self._async_client = ollama.AsyncClient(host=self.host, limits=_pool_limits())
+            except ImportError:
+                raise ImportError(
+                    "Ollama library not installed. Run: pip install ollama"
+                )
+        return self._async_client
+    
     def is_available(self) -> bool:
         """Check if Ollama server is running and model is available."""
         try:
-            client = self._get_client()
-            # Try to list models to check connectivity
-            models = client.list()
-            model_names = [m.get('name', '').split(':')[0] for m in models.get('models', [])]
-            return self.model.split(':')[0] in model_names or len(model_names) > 0
+            # Listing models doubles as the connectivity check
+            model_names = _ollama_model_names(self._get_client(), int(time.time() // _OLLAMA_LIST_TTL))
+            return self.model.split(':', 1)[0] in model_names or len(model_names) > 0
         except Exception:
             return False
     
+    @staticmethod
+    def _with_retries(request):
+        """Run request(), retrying transient failures with backoff."""
+        for attempt in range(_OLLAMA_RETRIES + 1):
+            try:
+                return request()
+            except Exception as exc:
+                if attempt == _OLLAMA_RETRIES or not _ollama_transient(exc):
+                    raise
+            time.sleep(_ollama_delay(attempt))
+    
+    @staticmethod
+    async def _awith_retries(request):
+        """Await request(), retrying transient failures with backoff."""
+        for attempt in range(_OLLAMA_RETRIES + 1):
+            try:
+                return await request()
+            except Exception as exc:
+                if attempt == _OLLAMA_RETRIES or not _ollama_transient(exc):
+                    raise
+            await asyncio.sleep(_ollama_delay(attempt))
+    
     def chat(self, prompt: str, schema: Dict[str, Any]) -> LLMResponse:
         """Send chat with structured output format."""
         client = self._get_client()
         
-        response = client.chat(
+        # A malformed (e.g. truncated) JSON reply is re-requested once
+        for attempt in range(_JSON_ATTEMPTS):
+            response = self._with_retries(lambda: client.chat(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                format=schema,
+                options={
+                    "temperature": 0.7,
+                    "num_predict": 2000
+                }
+            ))
+            raw_text = response['message']['content']
+            try:
+                content = _loads(raw_text)
+                break
+            except ValueError:
+                if attempt == _JSON_ATTEMPTS - 1:
+                    raise
+        
+        return LLMResponse(
+            content=content,
+            model=self.model,
+            provider=self.provider,
+            raw_text=raw_text
+        )
+    
+    def stream_chat(self, prompt: str, schema: Dict[str, Any]) -> Iterator[str]:
+        """
+        Stream the structured output as text chunks as the model generates them.
+        
+        Join the chunks and parse the JSON once the stream ends.
+        """
+        client = self._get_client()
+        
+        stream = client.chat(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             format=schema,
             options={
                 "temperature": 0.7,
                 "num_predict": 2000
-            }
+            },
+            stream=True
         )
+        for chunk in stream:
+            yield chunk['message']['content']
+    
+    async def achat(self, prompt: str, schema: Dict[str, Any]) -> LLMResponse:
+        """Async chat with structured output format."""
+        client = self._get_async_client()
         
-        raw_text = response['message']['content']
-        content = json.loads(raw_text)
+        # A malformed (e.g. truncated) JSON reply is re-requested once
+        for attempt in range(_JSON_ATTEMPTS):
+            response = await self._awith_retries(lambda: client.chat(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                format=schema,
+                options={
+                    "temperature": 0.7,
+                    "num_predict": 2000
+                }
+            ))
+            raw_text = response['message']['content']
+            try:
+                content = _loads(raw_text)
+                break
+            except ValueError:
+                if attempt == _JSON_ATTEMPTS - 1:
+                    raise
         
         return LLMResponse(
             content=content,
             model=self.model,
-            provider="ollama",
+            provider=self.provider,
             raw_text=raw_text
         )
 
@@ -115,6 +387,8 @@ class OllamaProvider(LLMProvider):
 class OpenAIProvider(LLMProvider):
     """OpenAI API provider - works on cloud deployments."""
     
+    provider = "openai"
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -123,6 +397,7 @@ class OpenAIProvider(LLMProvider):
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         self.model = model
         self._client = None
+        self._async_client = None
     
     @property
     def name(self) -> str:
@@ -133,13 +408,32 @@ class OpenAIProvider(LLMProvider):
         if self._client is None:
             try:
                 from openai import OpenAI
-                self._client = OpenAI(api_key=self.api_key)
+                self._client = _shared_client(
+                    ("openai", self.api_key),
+                    lambda: OpenAI(
+                        api_key=self.api_key, http_client=_http_client(), max_retries=_MAX_RETRIES
+                    )
+                )
             except ImportError:
                 raise ImportError(
                     "OpenAI library not installed. Run: pip install openai"
                 )
         return self._client
     
+    def _get_async_client(self):
+        """Lazy initialize OpenAI async client."""
+        if self._async_client is None:
+            try:
+                from openai import AsyncOpenAI
+                self._async_client = AsyncOpenAI(
+                    api_key=self.api_key, http_client=_async_http_client(), max_retries=_MAX_RETRIES
+                )
+            except ImportError:
+                raise ImportError(
+                    "OpenAI library not installed. Run: pip install openai"
+                )
+        return self._async_client
+    
     def is_available(self) -> bool:
         """Check if API key is configured."""
         return bool(self.api_key)
@@ -148,36 +442,88 @@ class OpenAIProvider(LLMProvider):
         """Send chat with structured JSON output."""
         client = self._get_client()
         
-        # Add JSON instruction to prompt
-        json_prompt = f"""{prompt}
-
-Return your response as valid JSON matching this schema:
-{json.dumps(schema, indent=2)}
-
-Respond ONLY with valid JSON, no other text."""
+        # A malformed (e.g. truncated) JSON reply is re-requested once
+        for attempt in range(_JSON_ATTEMPTS):
+            response = client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                response_format=_openai_response_format(schema),
+                max_tokens=2000,
+                temperature=0.7
+            )
+            raw_text = response.choices[0].message.content
+            try:
+                content = _loads(raw_text)
+                break
+            except ValueError:
+                if attempt == _JSON_ATTEMPTS - 1:
+                    raise
         
-        response = client.chat.completions.create(
+        return LLMResponse(
+            content=content,
             model=self.model,
-            messages=[{"role": "user", "content": json_prompt}],
-            response_format={"type": "json_object"},
+            provider=self.provider,
+            raw_text=raw_text
+        )
+    
+    def stream_chat(self, prompt: str, schema: Dict[str, Any]) -> Iterator[str]:
+        """Stream the JSON reply as text chunks; join and parse once the stream ends."""
+        client = self._get_client()
+        
+        stream = client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            response_format=_openai_response_format(schema),
             max_tokens=2000,
-            temperature=0.7
+            temperature=0.7,
+            stream=True
         )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def achat(self, prompt: str, schema: Dict[str, Any]) -> LLMResponse:
+        """Async chat with structured JSON output."""
+        client = self._get_async_client()
         
-        raw_text = response.choices[0].message.content
-        content = json.loads(raw_text)
+        # A malformed (e.g. truncated) JSON reply is re-requested once
+        for attempt in range(_JSON_ATTEMPTS):
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                response_format=_openai_response_format(schema),
+                max_tokens=2000,
+                temperature=0.7
+            )
+            raw_text = response.choices[0].message.content
+            try:
+                content = _loads(raw_text)
+                break
+            except ValueError:
+                if attempt == _JSON_ATTEMPTS - 1:
+                    raise
         
         return LLMResponse(
             content=content,
             model=self.model,
-            provider="openai",
+            provider=self.provider,
             raw_text=raw_text
         )
 
 
+def _tool_input(message) -> Dict[str, Any]:
+    """Arguments of the forced structured_output tool call in an Anthropic message."""
+    for block in message.content:
+        if block.type == "tool_use":
+            return block.input
+    raise ValueError("Anthropic response contained no structured_output tool call")
+
+
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude API provider."""
     
+    provider = "anthropic"
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -186,6 +532,7 @@ class AnthropicProvider(LLMProvider):
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         self.model = model
         self._client = None
+        self._async_client = None
     
     @property
     def name(self) -> str:
@@ -196,13 +543,32 @@ class AnthropicProvider(LLMProvider):
         if self._client is None:
             try:
                 import anthropic
-                self._client = anthropic.Anthropic(api_key=self.api_key)
+                self._client = _shared_client(
+                    ("anthropic", self.api_key),
+                    lambda: anthropic.Anthropic(
+                        api_key=self.api_key, http_client=_http_client(), max_retries=_MAX_RETRIES
+                    )
+                )
             except ImportError:
                 raise ImportError(
                     "Anthropic library not installed. Run: pip install anthropic"
                 )
         return self._client
     
+    def _get_async_client(self):
+        """Lazy initialize Anthropic async client."""
+        if self._async_client is None:
+            try:
+                import anthropic
+                self._async_client = anthropic.AsyncAnthropic(
+                    api_key=self.api_key, http_client=_async_http_client(), max_retries=_MAX_RETRIES
+                )
+            except ImportError:
+                raise ImportError(
+                    "Anthropic library not installed. Run: pip install anthropic"
+                )
+        return self._async_client
+    
     def is_available(self) -> bool:
         """Check if API key is configured."""
         return bool(self.api_key)
@@ -211,31 +577,349 @@ class AnthropicProvider(LLMProvider):
         """Send chat with structured output format."""
         client = self._get_client()
         
-        # Add JSON instruction to prompt for Claude
-        json_prompt = f"""{prompt}
-
-Return your response as valid JSON matching this schema:
-{json.dumps(schema, indent=2)}
-
-Respond ONLY with valid JSON, no other text."""
-        
         message = client.messages.create(
             model=self.model,
             max_tokens=2000,
-            messages=[{"role": "user", "content": json_prompt}]
+            messages=[{"role": "user", "content": prompt}],
+            tools=[_anthropic_tool(schema)],
+            tool_choice={"type": "tool", "name": _ANTHROPIC_TOOL_NAME}
+        )
+        
+        content = _tool_input(message)
+        raw_text = _dumps(content)
+        
+        return LLMResponse(
+            content=content,
+            model=self.model,
+            provider=self.provider,
+            raw_text=raw_text
+        )
+    
+    def stream_chat(self, prompt: str, schema: Dict[str, Any]) -> Iterator[str]:
+        """Stream the JSON reply as text chunks; join and parse once the stream ends."""
+        client = self._get_client()
+        
+        with client.messages.stream(
+            model=self.model,
+            max_tokens=2000,
+            messages=[{"role": "user", "content": prompt}],
+            tools=[_anthropic_tool(schema)],
+            tool_choice={"type": "tool", "name": _ANTHROPIC_TOOL_NAME}
+        ) as stream:
+            # The JSON arrives as the forced tool call's argument deltas
+            for event in stream:
+                if event.type == "input_json" and event.partial_json:
+                    yield event.partial_json
+    
+    async def achat(self, prompt: str, schema: Dict[str, Any]) -> LLMResponse:
+        """Async chat with structured output format."""
+        client = self._get_async_client()
+        
+        message = await client.messages.create(
+            model=self.model,
+            max_tokens=2000,
+            messages=[{"role": "user", "content": prompt}],
+            tools=[_anthropic_tool(schema)],
+            tool_choice={"type": "tool", "name": _ANTHROPIC_TOOL_NAME}
         )
         
-        raw_text = message.content[0].text
-        content = json.loads(raw_text)
+        content = _tool_input(message)
+        raw_text = _dumps(content)
         
         return LLMResponse(
             content=content,
             model=self.model,
-            provider="anthropic",
+            provider=self.provider,
             raw_text=raw_text
         )
 
 
+def _scope_text(provider: LLMProvider, schema: Dict[str, Any]) -> str:
+    """Provider class, model and canonical schema: what a cached reply is only valid for."""
+    return f"{type(provider).__name__}|{provider.model}|{_schema_text(schema, sort_keys=True)}"
+
+
+def _joined_response(provider: LLMProvider, chunks: List[str]) -> LLMResponse:
+    """LLMResponse for a reply streamed by provider.stream_chat()."""
+    raw_text = "".join(chunks)
+    return LLMResponse(
+        content=_loads(raw_text), model=provider.model, provider=provider.provider, raw_text=raw_text
+    )
+
+
+class CachingLLMProvider(LLMProvider):
+    """
+    Exact-match response cache around another provider.
+    
+    Responses are keyed on sha256(provider class | model | schema | prompt)
+    and kept in an in-memory LRU of max_size entries. With db_path set they
+    are also persisted to SQLite. Entries older than ttl seconds are ignored
+    in both.
+    """
+    
+    def __init__(
+        self,
+        inner: LLMProvider,
+        max_size: int = 1024,
+        db_path: Optional[str] = None,
+        ttl: Optional[float] = None
+    ):
+        self.inner = inner
+        self.max_size = max_size
+        self.ttl = ttl
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (ts, response)
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, blob BLOB, ts INTEGER)"
+            )
+            self._db.commit()
+    
+    @property
+    def name(self) -> str:
+        return self.inner.name
+    
+    @property
+    def model(self) -> str:
+        return self.inner.model
+    
+    @property
+    def provider(self) -> str:
+        return self.inner.provider
+    
+    def is_available(self) -> bool:
+        return self.inner.is_available()
+    
+    def _key(self, prompt: str, schema: Dict[str, Any]) -> str:
+        return hashlib.sha256(f"{_scope_text(self.inner, schema)}|{prompt}".encode()).hexdigest()
+    
+    def _fresh(self, ts: float) -> bool:
+        return self.ttl is None or time.time() - ts < self.ttl
+    
+    def _get(self, key: str) -> Optional[LLMResponse]:
+        """Cached response for key (a copy, so callers can't mutate the cache), or None."""
+        response = None
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if self._fresh(entry[0]):
+                    response = entry[1]
+                    self._cache.move_to_end(key)
+                else:
+                    del self._cache[key]
+            elif self._db is not None:
+                row = self._db.execute("SELECT blob, ts FROM cache WHERE key = ?", (key,)).fetchone()
+                if row and self._fresh(row[1]):
+                    response = LLMResponse(**_loads(row[0]))
+                    self._remember(key, response, row[1])
+        if response is None:
+            return None
+        return replace(response, content=copy.deepcopy(response.content))
+    
+    def _put(self, key: str, response: LLMResponse) -> None:
+        """Cache a copy of response, so later edits by the caller don't leak in."""
+        response = replace(response, content=copy.deepcopy(response.content))
+        ts = time.time()
+        with self._lock:
+            self._remember(key, response, ts)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, blob, ts) VALUES (?, ?, ?)",
+                    (key, _dumps(asdict(response)).encode(), int(ts))
+                )
+                self._db.commit()
+    
+    def _remember(self, key: str, response: LLMResponse, ts: float) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entry when full (lock held)."""
+        self._cache[key] = (ts, response)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+    
+    def chat(self, prompt: str, schema: Dict[str, Any]) -> LLMResponse:
+        key = self._key(prompt, schema)
+        response = self._get(key)
+        if response is None:
+            response = self.inner.chat(prompt, schema)
+            self._put(key, response)
+        return response
+    
+    async def achat(self, prompt: str, schema: Dict[str, Any]) -> LLMResponse:
+        key = self._key(prompt, schema)
+        response = self._get(key)
+        if response is None:
+            response = await self.inner.achat(prompt, schema)
+            self._put(key, response)
+        return response
+    
+    def stream_chat(self, prompt: str, schema: Dict[str, Any]) -> Iterator[str]:
+        """Replay a cached reply as one chunk; otherwise stream and cache the joined result."""
+        key = self._key(prompt, schema)
+        response = self._get(key)
+        if response is not None:
+            yield response.raw_text
+            return
+        
+        chunks = []
+        for chunk in self.inner.stream_chat(prompt, schema):
+            chunks.append(chunk)
+            yield chunk
+        self._put(key, _joined_response(self.inner, chunks))
+
+
+class SemanticCachingProvider(LLMProvider):
+    """
+    Similarity-based response cache around another provider.
+    
+    Prompts are embedded with a small sentence-transformers model and looked
+    up in a persistent Chroma collection, filtered to the same provider and
+    schema. A stored reply is returned when the nearest prompt is within
+    max_distance (cosine), so rephrasings of an earlier prompt reuse its reply.
+    Requires: pip install sentence-transformers chromadb
+    """
+    
+    def __init__(
+        self,
+        inner: LLMProvider,
+        db_path: str = ".cache/semantic",
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        max_distance: float = 0.15,
+        collection: str = "llm_responses"
+    ):
+        self.inner = inner
+        self.db_path = db_path
+        self.model_name = model_name
+        self.max_distance = max_distance
+        self.collection_name = collection
+        self._encoder = None
+        self._collection = None
+        self._lock = threading.Lock()
+    
+    @property
+    def name(self) -> str:
+        return self.inner.name
+    
+    @property
+    def model(self) -> str:
+        return self.inner.model
+    
+    @property
+    def provider(self) -> str:
+        return self.inner.provider
+    
+    def is_available(self) -> bool:
+        return self.inner.is_available()
+    
+    @property
+    def encoder(self):
+        if self._encoder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                raise ImportError(
+                    "sentence-transformers not installed. Run: pip install sentence-transformers"
+                )
+            self._encoder = SentenceTransformer(self.model_name)
+        return self._encoder
+    
+    @property
+    def collection(self):
+        if self._collection is None:
+            try:
+                import chromadb
+            except ImportError:
+                raise ImportError(
+                    "chromadb not installed. Run: pip install chromadb"
+                )
+            client = chromadb.PersistentClient(path=self.db_path)
+            self._collection = client.get_or_create_collection(
+                self.collection_name, metadata={"hnsw:space": "cosine"}
+            )
+        return self._collection
+    
+    def _scope(self, schema: Dict[str, Any]) -> str:
+        """Hash of provider class, model and schema; only entries with the same scope can match."""
+        return hashlib.sha256(_scope_text(self.inner, schema).encode()).hexdigest()
+    
+    def _lookup(self, prompt: str, schema: Dict[str, Any]) -> tuple:
+        """(embedding, scope, cached response or None) for a prompt."""
+        scope = self._scope(schema)
+        with self._lock:
+            embedding = self.encoder.encode(prompt, normalize_embeddings=True).tolist()
+            result = self.collection.query(
+                query_embeddings=[embedding], n_results=1, where={"scope": scope}
+            )
+        if not result["ids"][0] or result["distances"][0][0] >= self.max_distance:
+            return embedding, scope, None
+        
+        raw_text = result["documents"][0][0]
+        meta = result["metadatas"][0][0]
+        return embedding, scope, LLMResponse(
+            content=_loads(raw_text), model=meta["model"], provider=meta["provider"], raw_text=raw_text
+        )
+    
+    def _put(self, prompt: str, embedding: list, scope: str, response: LLMResponse) -> None:
+        key = hashlib.sha256(f"{scope}|{prompt}".encode()).hexdigest()
+        with self._lock:
+            self.collection.upsert(
+                ids=[key],
+                embeddings=[embedding],
+                documents=[response.raw_text],
+                metadatas=[{"scope": scope, "model": response.model, "provider": response.provider}]
+            )
+    
+    def chat(self, prompt: str, schema: Dict[str, Any]) -> LLMResponse:
+        embedding, scope, response = self._lookup(prompt, schema)
+        if response is None:
+            response = self.inner.chat(prompt, schema)
+            self._put(prompt, embedding, scope, response)
+        return response
+    
+    async def achat(self, prompt: str, schema: Dict[str, Any]) -> LLMResponse:
+        embedding, scope, response = await asyncio.to_thread(self._lookup, prompt, schema)
+        if response is None:
+            response = await self.inner.achat(prompt, schema)
+            await asyncio.to_thread(self._put, prompt, embedding, scope, response)
+        return response
+    
+    def stream_chat(self, prompt: str, schema: Dict[str, Any]) -> Iterator[str]:
+        """Replay a cached reply as one chunk; otherwise stream and cache the joined result."""
+        embedding, scope, response = self._lookup(prompt, schema)
+        if response is not None:
+            yield response.raw_text
+            return
+        
+        chunks = []
+        for chunk in self.inner.stream_chat(prompt, schema):
+            chunks.append(chunk)
+            yield chunk
+        self._put(prompt, embedding, scope, _joined_response(self.inner, chunks))
+
+
+async def abatch_chat(
+    provider: LLMProvider,
+    prompts: List[str],
+    schema: Dict[str, Any],
+    concurrency: int = 8,
+    return_exceptions: bool = False
+) -> List[LLMResponse]:
+    """
+    Run achat() over many prompts with at most `concurrency` requests in flight.
+    
+    Results come back in prompt order. With return_exceptions=True a failed
+    prompt yields its exception instead of cancelling the batch.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def one(prompt: str) -> LLMResponse:
+        async with semaphore:
+            return await provider.achat(prompt, schema)
+    
+    return await asyncio.gather(*(one(p) for p in prompts), return_exceptions=return_exceptions)
+
+
 def get_provider(
     provider_type: str = "openai",
     **kwargs
@@ -245,11 +929,21 @@ def get_provider(
     
     Args:
         provider_type: "ollama", "openai", or "anthropic"
-        **kwargs: Provider-specific configuration
+        **kwargs: Provider-specific configuration, plus cache=True to wrap the
+            provider in a CachingLLMProvider (cache_path, cache_size and
+            cache_ttl are passed through to it)
         
     Returns:
         Configured LLMProvider instance
     """
+    if kwargs.pop("cache", False):
+        return CachingLLMProvider(
+            get_provider(provider_type, **{k: v for k, v in kwargs.items() if not k.startswith("cache_")}),
+            max_size=kwargs.get("cache_size", 1024),
+            db_path=kwargs.get("cache_path"),
+            ttl=kwargs.get("cache_ttl")
+        )
+    
     if provider_type.lower() == "ollama":
         return OllamaProvider(
             model=kwargs.get("model", os.environ.get("OLLAMA_MODEL", "llama3.1")),
@@ -269,11 +963,30 @@ def get_provider(
         raise ValueError(f"Unknown provider type: {provider_type}")
 
 
+# Default-configured instances reused by get_available_providers()
+_PROBE_PROVIDERS: Dict[str, LLMProvider] = {}
+_PROBE_TTL = 30  # seconds a probe result is reused
+
+
+@lru_cache(maxsize=8)
+def _probe(kind: str, time_bucket: int) -> bool:
+    """is_available() for a probe provider, memoized per _PROBE_TTL window."""
+    return _PROBE_PROVIDERS[kind].is_available()
+
+
 def get_available_providers() -> Dict[str, bool]:
-    """Check which providers are available."""
-    return {
-        "ollama": OllamaProvider().is_available(),
-        "openai": OpenAIProvider().is_available(),
-        "anthropic": AnthropicProvider().is_available()
-    }
+    """
+    Check which providers are available.
+    
+    Each result is reused for up to _PROBE_TTL seconds. Probes run in turn:
+    only Ollama's touches the network, so threads would buy nothing.
+    """
+    if not _PROBE_PROVIDERS:
+        _PROBE_PROVIDERS.update(
+            ollama=OllamaProvider(),
+            openai=OpenAIProvider(),
+            anthropic=AnthropicProvider()
+        )
+    time_bucket = int(time.time() // _PROBE_TTL)
+    return {kind: _probe(kind, time_bucket) for kind in _PROBE_PROVIDERS}
 
@@ -0,0 +1,94 @@
+"""
+CMS Scoring Kernels - Numeric scoring over capability matrices
+Compiled with Numba when available, pure NumPy otherwise
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+# Compiled kernels are cached next to this module, whatever the working directory
+os.environ.setdefault("NUMBA_CACHE_DIR", str(Path(__file__).resolve().parent / ".numba_cache"))
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _score_numpy(caps, required, required_counts, selected_idx):
+    """Vectorized reference implementation of score_platforms()."""
+    n_platforms = caps.shape[0]
+    business_fit = np.minimum(caps.mean(axis=1) / 3.0, 1.0)
+
+    if len(selected_idx) == 0:
+        use_case_fit = np.zeros(n_platforms)
+    else:
+        req = required[selected_idx]
+        ratios = np.divide(
+            caps[:, None, :], req[None, :, :],
+            out=np.zeros((n_platforms,) + req.shape, dtype=np.float64),
+            where=req[None, :, :] > 0
+        )
+        use_case_fit = (ratios.sum(axis=2) / np.maximum(required_counts[selected_idx], 1)).mean(axis=1)
+
+    composite = use_case_fit * 0.6 + business_fit * 0.4
+    return use_case_fit, business_fit, composite
+
+
+def _score_loops(caps, required, required_counts, selected_idx):
+    """Loop implementation of score_platforms(), compiled by Numba."""
+    n_platforms, n_caps = caps.shape
+    n_selected = selected_idx.shape[0]
+    use_case_fit = np.zeros(n_platforms)
+    business_fit = np.zeros(n_platforms)
+    composite = np.zeros(n_platforms)
+
+    for p in range(n_platforms):
+        total = 0.0
+        for c in range(n_caps):
+            total += caps[p, c]
+        business_fit[p] = min(total / n_caps / 3.0, 1.0)
+
+        fit = 0.0
+        for s in range(n_selected):
+            u = selected_idx[s]
+            uc_score = 0.0
+            for c in range(n_caps):
+                if required[u, c] > 0:
+                    uc_score += caps[p, c] / required[u, c]
+            fit += uc_score / max(required_counts[u], 1.0)
+        if n_selected > 0:
+            use_case_fit[p] = fit / n_selected
+
+        composite[p] = use_case_fit[p] * 0.6 + business_fit[p] * 0.4
+
+    return use_case_fit, business_fit, composite
+
+
+if njit is not None:
+    _score = njit(cache=True, fastmath=True)(_score_loops)
+else:
+    _score = _score_numpy
+
+
+def score_platforms(caps, required, required_counts, selected_idx):
+    """
+    Score every platform against the selected use cases.
+
+    Args:
+        caps: (n_platforms, n_capabilities) capability levels
+        required: (n_use_cases, n_capabilities) minimum levels, 0 = not required
+        required_counts: (n_use_cases,) number of requirements per use case
+        selected_idx: indices of the selected use cases
+
+    Returns:
+        (use_case_fit, business_fit, composite) arrays, one entry per platform
+    """
+    return _score(
+        np.ascontiguousarray(caps, dtype=np.float64),
+        np.ascontiguousarray(required, dtype=np.float64),
+        np.ascontiguousarray(required_counts, dtype=np.float64),
+        np.asarray(selected_idx, dtype=np.int64)
+    )
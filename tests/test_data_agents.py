@@ -0,0 +1,34 @@
+from data_agents import _TextExtractor, dedupe_blocks
+
+
+def _text(html: str) -> str:
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.text()
+
+
+def test_inline_markup_stays_on_one_line():
+    html = "<p>Deliver <b>fast</b> pages with our <a>CDN</a></p><p>Next</p>"
+    assert _text(html) == "Deliver fast pages with our CDN\n\nNext"
+
+
+def test_table_rows_are_lines_of_tab_separated_cells():
+    html = (
+        "<nav>Menu</nav><table>"
+        "<tr><th>Feature</th><th>Free</th><th>Pro</th></tr>"
+        "<tr><td>SSO</td><td>No</td><td>Yes</td></tr>"
+        "</table>"
+    )
+    assert _text(html) == "Feature\tFree\tPro\nSSO\tNo\tYes"
+
+
+def test_dedupe_keeps_repeated_table_cells():
+    table = "Feature\tFree\tPro\nSSO\tNo\tYes\nAPI\tYes\tYes\nSeats\tUnlimited\tUnlimited\nYes\nNo\nYes"
+    assert dedupe_blocks(table) == table
+
+
+def test_dedupe_drops_repeated_long_paragraphs():
+    pitch = "Our composable platform scales with your team. " * 5
+    text = f"Features\n\n{pitch}\n\nSSO\tYes\n\nPricing\n\n{pitch}\n\nSSO\tYes"
+    assert dedupe_blocks(text) == f"Features\n\n{pitch}\n\nSSO\tYes\n\nPricing\n\nSSO\tYes"
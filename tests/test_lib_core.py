@@ -0,0 +1,47 @@
+import copy
+import pickle
+
+import pytest
+
+from lib_core import (
+    BusinessOutcome, Capability, CapabilityScorer, CMSOntology, PlatformAssessment, UseCase
+)
+
+
+@pytest.mark.parametrize("obj", [
+    Capability(key="delivery", label="Delivery", facets=["cdn"], scale="0-3", importance="high"),
+    UseCase(key="commerce", label="Commerce", required_capabilities={"delivery": 2}),
+    BusinessOutcome(key="revenue", label="Revenue", weight=0.5),
+])
+def test_ontology_objects_pickle_and_deepcopy(obj):
+    assert pickle.loads(pickle.dumps(obj)) == obj
+    assert copy.deepcopy(obj) == obj
+
+
+def test_batch_score_matches_composite_score():
+    ontology = CMSOntology({
+        "capabilities": {
+            "delivery": {"label": "Delivery", "facets": [], "scale": "0-3", "importance": "high"},
+            "workflow": {"label": "Workflow", "facets": [], "scale": "0-3", "importance": "medium"},
+        },
+        "use_cases": {
+            "commerce": {"label": "Commerce", "required_capabilities": {"delivery": 2, "workflow": 0}},
+            # "search" is required but not defined in the ontology
+            "portal": {"label": "Portal", "required_capabilities": {"workflow": 3, "search": 2}},
+        },
+    })
+    assessments = [
+        PlatformAssessment(
+            platform=name, capability_scores=scores, strengths=[], weaknesses=[],
+            best_for_use_case="", overall_fit_score=fit
+        )
+        for name, scores, fit in [
+            ("A", {"delivery": 3, "workflow": 1, "search": 2}, 0.8),
+            ("B", {"delivery": 1}, 0.5),
+        ]
+    ]
+    scorer = CapabilityScorer(ontology)
+    use_case_keys = ["commerce", "portal", "unknown"]
+    
+    expected = [scorer.composite_score(a, use_case_keys) for a in assessments]
+    assert scorer.batch_score(assessments, use_case_keys) == pytest.approx(expected, rel=1e-6)